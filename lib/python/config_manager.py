@@ -13,45 +13,230 @@ Features:
 - Configuration merging and inheritance
 """
 
+import copy
+import functools
+import ipaddress
+import itertools
 import os
 import sys
-import yaml
-import json
+import threading
 import re
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+import dataclasses
 from dataclasses import dataclass, field
 
+# orjson is much faster for the .json persistence path; fall back to
+# the stdlib when it is not installed
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-@dataclass
+# PyYAML is imported lazily: --validate/--summary CLI runs on cached or
+# JSON configs never pay its import cost
+_YAML_CODECS = None
+
+
+def _get_yaml():
+    """Import PyYAML on first use and pick the libyaml-backed
+    loader/dumper when the C extension is available; safe_load alone
+    always takes the pure-Python path.
+
+    Returns (module, loader, dumper).
+    """
+    global _YAML_CODECS
+    if _YAML_CODECS is None:
+        import yaml
+        try:
+            from yaml import CSafeLoader as loader, CSafeDumper as dumper
+        except ImportError:
+            from yaml import SafeLoader as loader, SafeDumper as dumper
+        _YAML_CODECS = (yaml, loader, dumper)
+    return _YAML_CODECS
+
+# Validation patterns, compiled once at import: validate() runs these on
+# every config load and env-var merge, so skip the per-call re-cache
+# lookup. Applied via fullmatch, so no ^/$ anchors needed in the
+# patterns themselves.
+_DOMAIN_RE = re.compile(r'[a-zA-Z0-9](?:[a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?)*')
+_EMAIL_RE = re.compile(r'[^@]+@[^@]+\.[^@]+')
+_RETENTION_RE = re.compile(r'\d+[dwmy]')
+_NAME_RE = re.compile(r'[a-zA-Z0-9](?:[a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?')
+
+# Shared empty result for the common all-valid case so validate() does
+# not allocate a fresh list per call; callers only iterate over it
+_NO_ERRORS: Sequence[str] = ()
+
+# Shared immutable defaults for list-valued fields: every section
+# construction reuses these tuples instead of running a default_factory
+# lambda that allocates a fresh list. The strings are interned so
+# validator equality checks can short-circuit on identity.
+_DEFAULT_DNS = (sys.intern('1.1.1.1'), sys.intern('8.8.8.8'))
+_DEFAULT_ALERT_CHANNELS = (sys.intern('email'),)
+
+
+# Parsed-config cache keyed on (resolved path, mtime_ns, size): repeated
+# load_config calls skip the YAML parse while file edits still invalidate
+_PARSE_CACHE: Dict[tuple, 'PiSwarmConfig'] = {}
+_PARSE_CACHE_LOCK = threading.Lock()
+_PARSE_CACHE_MAX = 16
+
+
+def _wants_json(config_path: Path) -> bool:
+    """Whether a config path should be persisted as JSON instead of YAML."""
+    return (config_path.suffix == '.json'
+            or os.environ.get('PI_SWARM_CONFIG_FORMAT') == 'json')
+
+
+def _dump_json_bytes(data: Dict[str, Any]) -> bytes:
+    """Serialize a config dict to indented JSON bytes."""
+    if HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    import json
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+def _section_from_dict(cls, data: Optional[Dict[str, Any]]):
+    """Build a config section dataclass from a YAML section dict.
+
+    Unknown keys are dropped so stray entries in the file don't break
+    the constructor; missing keys fall back to dataclass defaults.
+    """
+    if not data:
+        return cls()
+    known = {f.name for f in dataclasses.fields(cls)}
+    return cls(**{k: v for k, v in data.items() if k in known})
+
+
+def _valid_ipv4(s: str) -> bool:
+    """Check that a string is a valid IPv4 address.
+
+    ipaddress is C-backed and rejects out-of-range octets (e.g.
+    999.999.999.999) that the old digit-run regex accepted.
+    """
+    try:
+        ipaddress.IPv4Address(s)
+        return True
+    except ValueError:
+        return False
+
+
+def _valid_subnet(s: str) -> bool:
+    """Check that a string is a valid IPv4 network in CIDR notation."""
+    if '/' not in s:
+        return False
+    try:
+        ipaddress.IPv4Network(s, strict=False)
+        return True
+    except ValueError:
+        return False
+
+
+def _compile_checks(checks) -> 'Callable':
+    """Compose a check table into a single validator callable.
+
+    The returned closure binds the checks and the empty-result singleton
+    locally, the way schema libraries compile a declarative schema down
+    to one plain function. Each check returns a falsy value on success,
+    an error string, or a list of error strings; the error list is only
+    allocated once a check actually fails.
+    """
+    def validator(obj, _checks=checks, _no_errors=_NO_ERRORS) -> Sequence[str]:
+        errors = None
+        for check in _checks:
+            result = check(obj)
+            if result:
+                if errors is None:
+                    errors = []
+                if isinstance(result, str):
+                    errors.append(result)
+                else:
+                    errors.extend(result)
+        return errors if errors is not None else _no_errors
+    return validator
+
+
+# Per-section validation tables, built once at import so each validate()
+# call is a plain loop over prebound closures rather than re-created
+# inline logic. Adding a field check means adding one entry here.
+_NETWORK_CHECKS = (
+    lambda c: None if _valid_subnet(c.subnet) else f"Invalid subnet format: {c.subnet}",
+    lambda c: None if _valid_ipv4(c.gateway) else f"Invalid gateway IP: {c.gateway}",
+    lambda c: [f"Invalid DNS server IP: {dns}"
+               for dns in c.dns_servers if not _valid_ipv4(dns)],
+)
+
+_STORAGE_CHECKS = (
+    lambda c: None if c.storage_solution in ("glusterfs", "nfs", "longhorn", "local")
+    else f"Invalid storage solution: {c.storage_solution}",
+    lambda c: None if c.min_storage_size_gb >= 1
+    else "Minimum storage size must be at least 1 GB",
+)
+
+_DNS_CHECKS = (
+    lambda c: None if _DOMAIN_RE.fullmatch(c.domain) else f"Invalid domain format: {c.domain}",
+    lambda c: [f"Invalid upstream DNS server IP: {dns}"
+               for dns in c.upstream_dns if not _valid_ipv4(dns)],
+)
+
+_SECURITY_CHECKS = (
+    lambda c: None if 1 <= c.ssh_port <= 65535
+    else f"SSH port must be between 1 and 65535: {c.ssh_port}",
+    lambda c: None if not c.ssl_cert_email or _EMAIL_RE.fullmatch(c.ssl_cert_email)
+    else f"Invalid email format: {c.ssl_cert_email}",
+)
+
+_VALID_ALERT_CHANNELS = ("email", "slack", "discord", "whatsapp")
+
+_MONITORING_CHECKS = (
+    lambda c: None if _RETENTION_RE.fullmatch(c.prometheus_retention)
+    else f"Invalid retention period format: {c.prometheus_retention}",
+    lambda c: [f"Invalid alert channel: {channel}"
+               for channel in c.alert_channels if channel not in _VALID_ALERT_CHANNELS],
+)
+
+_ROOT_CHECKS = (
+    lambda c: None if c.deployment_mode in ("automated", "interactive")
+    else f"Invalid deployment mode: {c.deployment_mode}",
+    lambda c: None if _NAME_RE.fullmatch(c.cluster_name)
+    else f"Invalid cluster name format: {c.cluster_name}",
+)
+
+# Each table compiled down to one callable at import
+_VALIDATE_NETWORK = _compile_checks(_NETWORK_CHECKS)
+_VALIDATE_STORAGE = _compile_checks(_STORAGE_CHECKS)
+_VALIDATE_DNS = _compile_checks(_DNS_CHECKS)
+_VALIDATE_SECURITY = _compile_checks(_SECURITY_CHECKS)
+_VALIDATE_MONITORING = _compile_checks(_MONITORING_CHECKS)
+_VALIDATE_ROOT = _compile_checks(_ROOT_CHECKS)
+
+# dataclass slots= landed in Python 3.10; the project still supports
+# older interpreters (Raspberry Pi OS Bullseye ships 3.9), so those get
+# plain frozen dataclasses and only newer ones get the slot layout
+if sys.version_info >= (3, 10):
+    _config_dataclass = functools.partial(dataclass, frozen=True, slots=True)
+else:
+    _config_dataclass = functools.partial(dataclass, frozen=True)
+
+
+@_config_dataclass
 class NetworkConfig:
     """Network configuration settings."""
     subnet: str = "192.168.1.0/24"
     gateway: str = "192.168.1.1"
-    dns_servers: List[str] = field(default_factory=lambda: ["1.1.1.1", "8.8.8.8"])
+    dns_servers: Sequence[str] = _DEFAULT_DNS
     pi_ip_range: str = "192.168.1.100-192.168.1.199"
     
-    def validate(self) -> List[str]:
+    def validate(self) -> Sequence[str]:
         """Validate network configuration."""
-        errors = []
-        
-        # Validate subnet format
-        if not re.match(r'^\d+\.\d+\.\d+\.\d+/\d+$', self.subnet):
-            errors.append(f"Invalid subnet format: {self.subnet}")
-        
-        # Validate gateway IP
-        if not re.match(r'^\d+\.\d+\.\d+\.\d+$', self.gateway):
-            errors.append(f"Invalid gateway IP: {self.gateway}")
-        
-        # Validate DNS servers
-        for dns in self.dns_servers:
-            if not re.match(r'^\d+\.\d+\.\d+\.\d+$', dns):
-                errors.append(f"Invalid DNS server IP: {dns}")
-        
-        return errors
+        if self == _DEFAULT_NETWORK:
+            return _NO_ERRORS
+        return _VALIDATE_NETWORK(self)
 
 
-@dataclass
+@_config_dataclass
 class StorageConfig:
     """Storage configuration settings."""
     enable_shared_storage: bool = False
@@ -60,45 +245,30 @@ class StorageConfig:
     auto_detect_ssd: bool = True
     min_storage_size_gb: int = 32
     
-    def validate(self) -> List[str]:
+    def validate(self) -> Sequence[str]:
         """Validate storage configuration."""
-        errors = []
-        
-        if self.storage_solution not in ["glusterfs", "nfs", "longhorn", "local"]:
-            errors.append(f"Invalid storage solution: {self.storage_solution}")
-        
-        if self.min_storage_size_gb < 1:
-            errors.append("Minimum storage size must be at least 1 GB")
-        
-        return errors
+        if self == _DEFAULT_STORAGE:
+            return _NO_ERRORS
+        return _VALIDATE_STORAGE(self)
 
 
-@dataclass
+@_config_dataclass
 class DNSConfig:
     """DNS configuration settings."""
     enable_pihole: bool = False
     pihole_ip: str = "auto"
     domain: str = "cluster.local"
-    upstream_dns: List[str] = field(default_factory=lambda: ["1.1.1.1", "8.8.8.8"])
+    upstream_dns: Sequence[str] = _DEFAULT_DNS
     admin_password: str = "piswarm123"
     
-    def validate(self) -> List[str]:
+    def validate(self) -> Sequence[str]:
         """Validate DNS configuration."""
-        errors = []
-        
-        # Validate domain format
-        if not re.match(r'^[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?)*$', self.domain):
-            errors.append(f"Invalid domain format: {self.domain}")
-        
-        # Validate upstream DNS
-        for dns in self.upstream_dns:
-            if not re.match(r'^\d+\.\d+\.\d+\.\d+$', dns):
-                errors.append(f"Invalid upstream DNS server IP: {dns}")
-        
-        return errors
+        if self == _DEFAULT_DNSCFG:
+            return _NO_ERRORS
+        return _VALIDATE_DNS(self)
 
 
-@dataclass
+@_config_dataclass
 class SecurityConfig:
     """Security configuration settings."""
     enable_firewall: bool = True
@@ -107,46 +277,30 @@ class SecurityConfig:
     enable_fail2ban: bool = True
     ssl_cert_email: str = ""
     
-    def validate(self) -> List[str]:
+    def validate(self) -> Sequence[str]:
         """Validate security configuration."""
-        errors = []
-        
-        if not (1 <= self.ssh_port <= 65535):
-            errors.append(f"SSH port must be between 1 and 65535: {self.ssh_port}")
-        
-        if self.ssl_cert_email and not re.match(r'^[^@]+@[^@]+\.[^@]+$', self.ssl_cert_email):
-            errors.append(f"Invalid email format: {self.ssl_cert_email}")
-        
-        return errors
+        if self == _DEFAULT_SECURITY:
+            return _NO_ERRORS
+        return _VALIDATE_SECURITY(self)
 
 
-@dataclass
+@_config_dataclass
 class MonitoringConfig:
     """Monitoring configuration settings."""
     enable_monitoring: bool = True
     prometheus_retention: str = "15d"
     grafana_admin_password: str = "admin"
     enable_alerts: bool = True
-    alert_channels: List[str] = field(default_factory=lambda: ["email"])
+    alert_channels: Sequence[str] = _DEFAULT_ALERT_CHANNELS
     
-    def validate(self) -> List[str]:
+    def validate(self) -> Sequence[str]:
         """Validate monitoring configuration."""
-        errors = []
-        
-        # Validate retention period format
-        if not re.match(r'^\d+[dwmy]$', self.prometheus_retention):
-            errors.append(f"Invalid retention period format: {self.prometheus_retention}")
-        
-        # Validate alert channels
-        valid_channels = ["email", "slack", "discord", "whatsapp"]
-        for channel in self.alert_channels:
-            if channel not in valid_channels:
-                errors.append(f"Invalid alert channel: {channel}")
-        
-        return errors
+        if self == _DEFAULT_MONITORING:
+            return _NO_ERRORS
+        return _VALIDATE_MONITORING(self)
 
 
-@dataclass
+@_config_dataclass
 class PiSwarmConfig:
     """Main Pi-Swarm configuration."""
     version: str = "2.0.0"
@@ -160,26 +314,134 @@ class PiSwarmConfig:
     security: SecurityConfig = field(default_factory=SecurityConfig)
     monitoring: MonitoringConfig = field(default_factory=MonitoringConfig)
     
-    def validate(self) -> List[str]:
+    def validate(self) -> Sequence[str]:
         """Validate complete configuration."""
-        errors = []
-        
-        # Validate deployment mode
-        if self.deployment_mode not in ["automated", "interactive"]:
-            errors.append(f"Invalid deployment mode: {self.deployment_mode}")
-        
-        # Validate cluster name
-        if not re.match(r'^[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?$', self.cluster_name):
-            errors.append(f"Invalid cluster name format: {self.cluster_name}")
-        
-        # Validate component configurations
-        errors.extend(self.network.validate())
-        errors.extend(self.storage.validate())
-        errors.extend(self.dns.validate())
-        errors.extend(self.security.validate())
-        errors.extend(self.monitoring.validate())
-        
-        return errors
+        if self == _DEFAULT_CONFIG:
+            return _NO_ERRORS
+        errors = list(itertools.chain(
+            _VALIDATE_ROOT(self),
+            self.network.validate(),
+            self.storage.validate(),
+            self.dns.validate(),
+            self.security.validate(),
+            self.monitoring.validate(),
+        ))
+        return errors or _NO_ERRORS
+
+
+# Summary layout parsed once at import; get_config_summary fills it with
+# format_map instead of re-evaluating a large f-string per call
+_SUMMARY_TEMPLATE = """Pi-Swarm Configuration Summary
+================================
+
+Cluster: {cluster_name} (v{version})
+Mode: {deployment_mode}
+
+Network:
+  Subnet: {subnet}
+  Gateway: {gateway}
+  DNS Servers: {dns_list}
+
+Storage:
+  Enabled: {storage_enabled}
+  Solution: {storage_solution}
+  Path: {storage_path}
+
+DNS:
+  Pi-hole: {pihole_enabled}
+  Domain: {domain}
+
+Security:
+  Firewall: {firewall_enabled}
+  SSH Port: {ssh_port}
+  Fail2ban: {fail2ban_enabled}
+
+Monitoring:
+  Enabled: {monitoring_enabled}
+  Alerts: {alerts_enabled}
+"""
+
+
+# Cached default instances. validate() compares against these first, so
+# the common built-from-defaults case (missing config file, untouched
+# sections) skips every field check; frozen dataclass equality is one
+# field-tuple compare against shared interned values.
+_DEFAULT_NETWORK = NetworkConfig()
+_DEFAULT_STORAGE = StorageConfig()
+_DEFAULT_DNSCFG = DNSConfig()
+_DEFAULT_SECURITY = SecurityConfig()
+_DEFAULT_MONITORING = MonitoringConfig()
+_DEFAULT_CONFIG = PiSwarmConfig()
+
+
+def _parse_bool(s: str) -> bool:
+    """Parse the truthy spellings accepted for boolean env vars."""
+    return s.lower() in ('true', '1', 'yes', 'on')
+
+
+@functools.lru_cache(maxsize=64)
+def _split_path(path: str) -> tuple:
+    """Memoized dot-path split: callers setting the same paths
+    repeatedly reuse the attribute-name tuple."""
+    return tuple(path.split('.'))
+
+
+def _replace_field(field_name: str) -> Callable:
+    """Setter for a top-level field on a frozen PiSwarmConfig."""
+    def setter(config, value):
+        return dataclasses.replace(config, **{field_name: value})
+    return setter
+
+
+def _replace_section_field(section_name: str, field_name: str) -> Callable:
+    """Setter for a field inside a frozen config section.
+
+    Rebuilds the section and the root via dataclasses.replace since the
+    config objects are immutable.
+    """
+    def setter(config, value):
+        section = dataclasses.replace(getattr(config, section_name),
+                                      **{field_name: value})
+        return dataclasses.replace(config, **{section_name: section})
+    return setter
+
+
+# Environment-variable overrides mapped to (setter, converter) pairs,
+# built once at import so the per-load merge is a plain lookup loop with
+# no dot-path splitting or attribute walking. Setters return a new
+# config since the dataclasses are frozen.
+_ENV_SETTERS = {
+    # Main config
+    'PI_SWARM_CLUSTER_NAME': (_replace_field('cluster_name'), str),
+    'PI_SWARM_DEPLOYMENT_MODE': (_replace_field('deployment_mode'), str),
+
+    # Network
+    'PI_SWARM_SUBNET': (_replace_section_field('network', 'subnet'), str),
+    'PI_SWARM_GATEWAY': (_replace_section_field('network', 'gateway'), str),
+
+    # Storage
+    'ENABLE_STORAGE': (_replace_section_field('storage', 'enable_shared_storage'), _parse_bool),
+    'STORAGE_SOLUTION': (_replace_section_field('storage', 'storage_solution'), str),
+    'AUTO_DETECT_SSD': (_replace_section_field('storage', 'auto_detect_ssd'), _parse_bool),
+
+    # DNS
+    'ENABLE_PIHOLE': (_replace_section_field('dns', 'enable_pihole'), _parse_bool),
+    'PIHOLE_IP': (_replace_section_field('dns', 'pihole_ip'), str),
+    'PIHOLE_DOMAIN': (_replace_section_field('dns', 'domain'), str),
+    'PIHOLE_WEB_PASSWORD': (_replace_section_field('dns', 'admin_password'), str),
+
+    # Security
+    'SSH_PORT': (_replace_section_field('security', 'ssh_port'), int),
+    'DISABLE_PASSWORD_AUTH': (_replace_section_field('security', 'disable_password_auth'), _parse_bool),
+
+    # Monitoring
+    'ENABLE_MONITORING': (_replace_section_field('monitoring', 'enable_monitoring'), _parse_bool),
+    'GRAFANA_ADMIN_PASSWORD': (_replace_section_field('monitoring', 'grafana_admin_password'), str),
+}
+
+# Frozen key view for a single set-intersection per merge instead of one
+# environ probe per mapping
+_ENV_KEY_SET = frozenset(_ENV_SETTERS)
 
 
 class ConfigManager:
@@ -188,214 +450,165 @@ class ConfigManager:
     def __init__(self, config_file: Optional[str] = None):
         self.config_file = config_file or "config/config.yml"
         self.config = PiSwarmConfig()
-        
+        self._cached_path: Optional[Path] = None
+        self._cached_path_name: Optional[str] = None
+        self._cached_resolved: Optional[str] = None
+
+    def _get_path(self) -> Path:
+        """Path object for config_file, rebuilt only when the name changes.
+
+        Also caches the resolved string used as the parse-cache key so
+        repeated load_config calls skip the resolve() syscalls.
+        """
+        if self._cached_path_name != self.config_file:
+            self._cached_path = Path(self.config_file)
+            self._cached_resolved = str(self._cached_path.resolve())
+            self._cached_path_name = self.config_file
+        return self._cached_path
+
     def load_config(self, config_file: Optional[str] = None) -> PiSwarmConfig:
         """Load configuration from YAML file."""
         if config_file:
             self.config_file = config_file
-        
-        config_path = Path(self.config_file)
-        
-        if not config_path.exists():
+
+        config_path = self._get_path()
+
+        try:
+            # One stat doubles as the existence check and supplies the
+            # cache key fields
+            st = config_path.stat()
+        except OSError:
             print(f"Warning: Config file {self.config_file} not found, using defaults", file=sys.stderr)
             return self.config
-        
+
         try:
-            with open(config_path, 'r') as f:
-                yaml_data = yaml.safe_load(f) or {}
-            
-            # Parse configuration sections
-            self.config = self._parse_config_dict(yaml_data)
-            
+            # Reuse the parsed result when the file is unchanged; the
+            # cache key includes mtime and size so edits invalidate it
+            cache_key = (self._cached_resolved, st.st_mtime_ns, st.st_size)
+            with _PARSE_CACHE_LOCK:
+                cached = _PARSE_CACHE.get(cache_key)
+
+            if cached is not None:
+                self.config = copy.deepcopy(cached)
+            else:
+                if config_path.suffix == '.json':
+                    with open(config_path, 'rb') as f:
+                        raw = f.read()
+                    if HAS_ORJSON:
+                        yaml_data = orjson.loads(raw) or {}
+                    else:
+                        import json
+                        yaml_data = json.loads(raw) or {}
+                else:
+                    yaml_mod, yaml_loader, _ = _get_yaml()
+                    try:
+                        with open(config_path, 'r') as f:
+                            yaml_data = yaml_mod.load(f, Loader=yaml_loader) or {}
+                    except yaml_mod.YAMLError as e:
+                        raise ValueError(f"Invalid YAML in config file: {e}")
+
+                # Parse configuration sections
+                self.config = self._parse_config_dict(yaml_data)
+                with _PARSE_CACHE_LOCK:
+                    if len(_PARSE_CACHE) >= _PARSE_CACHE_MAX:
+                        _PARSE_CACHE.clear()
+                    _PARSE_CACHE[cache_key] = copy.deepcopy(self.config)
+
             # Merge with environment variables
             self._merge_environment_variables()
-            
+
             return self.config
-            
-        except yaml.YAMLError as e:
-            raise ValueError(f"Invalid YAML in config file: {e}")
+
+        except ValueError:
+            raise
         except Exception as e:
             raise ValueError(f"Error loading config file: {e}")
     
     def _parse_config_dict(self, data: Dict[str, Any]) -> PiSwarmConfig:
-        """Parse configuration dictionary into PiSwarmConfig object."""
-        config = PiSwarmConfig()
-        
-        # Main config
-        config.version = data.get('version', config.version)
-        config.cluster_name = data.get('cluster_name', config.cluster_name)
-        config.deployment_mode = data.get('deployment_mode', config.deployment_mode)
-        
-        # Network config
-        if 'network' in data:
-            net_data = data['network']
-            config.network = NetworkConfig(
-                subnet=net_data.get('subnet', config.network.subnet),
-                gateway=net_data.get('gateway', config.network.gateway),
-                dns_servers=net_data.get('dns_servers', config.network.dns_servers),
-                pi_ip_range=net_data.get('pi_ip_range', config.network.pi_ip_range)
-            )
-        
-        # Storage config
-        if 'storage' in data:
-            storage_data = data['storage']
-            config.storage = StorageConfig(
-                enable_shared_storage=storage_data.get('enable_shared_storage', config.storage.enable_shared_storage),
-                storage_solution=storage_data.get('storage_solution', config.storage.storage_solution),
-                storage_path=storage_data.get('storage_path', config.storage.storage_path),
-                auto_detect_ssd=storage_data.get('auto_detect_ssd', config.storage.auto_detect_ssd),
-                min_storage_size_gb=storage_data.get('min_storage_size_gb', config.storage.min_storage_size_gb)
-            )
-        
-        # DNS config
-        if 'dns' in data:
-            dns_data = data['dns']
-            config.dns = DNSConfig(
-                enable_pihole=dns_data.get('enable_pihole', config.dns.enable_pihole),
-                pihole_ip=dns_data.get('pihole_ip', config.dns.pihole_ip),
-                domain=dns_data.get('domain', config.dns.domain),
-                upstream_dns=dns_data.get('upstream_dns', config.dns.upstream_dns),
-                admin_password=dns_data.get('admin_password', config.dns.admin_password)
-            )
-        
-        # Security config
-        if 'security' in data:
-            sec_data = data['security']
-            config.security = SecurityConfig(
-                enable_firewall=sec_data.get('enable_firewall', config.security.enable_firewall),
-                ssh_port=sec_data.get('ssh_port', config.security.ssh_port),
-                disable_password_auth=sec_data.get('disable_password_auth', config.security.disable_password_auth),
-                enable_fail2ban=sec_data.get('enable_fail2ban', config.security.enable_fail2ban),
-                ssl_cert_email=sec_data.get('ssl_cert_email', config.security.ssl_cert_email)
-            )
-        
-        # Monitoring config
-        if 'monitoring' in data:
-            mon_data = data['monitoring']
-            config.monitoring = MonitoringConfig(
-                enable_monitoring=mon_data.get('enable_monitoring', config.monitoring.enable_monitoring),
-                prometheus_retention=mon_data.get('prometheus_retention', config.monitoring.prometheus_retention),
-                grafana_admin_password=mon_data.get('grafana_admin_password', config.monitoring.grafana_admin_password),
-                enable_alerts=mon_data.get('enable_alerts', config.monitoring.enable_alerts),
-                alert_channels=mon_data.get('alert_channels', config.monitoring.alert_channels)
-            )
-        
-        return config
+        """Parse configuration dictionary into PiSwarmConfig object.
+
+        Section dicts are splatted straight into the dataclass
+        constructors (unknown YAML keys filtered out), so dataclass
+        defaults apply automatically for anything the file omits.
+        """
+        root = {k: data[k] for k in ('version', 'cluster_name', 'deployment_mode')
+                if k in data}
+        return PiSwarmConfig(
+            **root,
+            network=_section_from_dict(NetworkConfig, data.get('network')),
+            storage=_section_from_dict(StorageConfig, data.get('storage')),
+            dns=_section_from_dict(DNSConfig, data.get('dns')),
+            security=_section_from_dict(SecurityConfig, data.get('security')),
+            monitoring=_section_from_dict(MonitoringConfig, data.get('monitoring'))
+        )
     
     def _merge_environment_variables(self):
         """Merge environment variables into configuration."""
-        env_mappings = {
-            # Main config
-            'PI_SWARM_CLUSTER_NAME': ('cluster_name', str),
-            'PI_SWARM_DEPLOYMENT_MODE': ('deployment_mode', str),
-            
-            # Network
-            'PI_SWARM_SUBNET': ('network.subnet', str),
-            'PI_SWARM_GATEWAY': ('network.gateway', str),
-            
-            # Storage
-            'ENABLE_STORAGE': ('storage.enable_shared_storage', bool),
-            'STORAGE_SOLUTION': ('storage.storage_solution', str),
-            'AUTO_DETECT_SSD': ('storage.auto_detect_ssd', bool),
-            
-            # DNS
-            'ENABLE_PIHOLE': ('dns.enable_pihole', bool),
-            'PIHOLE_IP': ('dns.pihole_ip', str),
-            'PIHOLE_DOMAIN': ('dns.domain', str),
-            'PIHOLE_WEB_PASSWORD': ('dns.admin_password', str),
-            
-            # Security
-            'SSH_PORT': ('security.ssh_port', int),
-            'DISABLE_PASSWORD_AUTH': ('security.disable_password_auth', bool),
-            
-            # Monitoring
-            'ENABLE_MONITORING': ('monitoring.enable_monitoring', bool),
-            'GRAFANA_ADMIN_PASSWORD': ('monitoring.grafana_admin_password', str),
-        }
-        
-        for env_var, (config_path, var_type) in env_mappings.items():
-            env_value = os.environ.get(env_var)
-            if env_value is not None:
-                try:
-                    # Convert value to appropriate type
-                    if var_type == bool:
-                        value = env_value.lower() in ('true', '1', 'yes', 'on')
-                    elif var_type == int:
-                        value = int(env_value)
-                    else:
-                        value = env_value
-                    
-                    # Set value in config
-                    self._set_nested_value(config_path, value)
-                    
-                except ValueError as e:
-                    print(f"Warning: Invalid value for {env_var}: {env_value}", file=sys.stderr)
+        env = os.environ
+        for env_var in _ENV_KEY_SET & env.keys():
+            setter, convert = _ENV_SETTERS[env_var]
+            env_value = env[env_var]
+            try:
+                self.config = setter(self.config, convert(env_value))
+            except ValueError:
+                print(f"Warning: Invalid value for {env_var}: {env_value}", file=sys.stderr)
     
     def _set_nested_value(self, path: str, value: Any):
-        """Set a nested configuration value using dot notation."""
-        parts = path.split('.')
-        obj = self.config
-        
+        """Set a nested configuration value using dot notation.
+
+        The config dataclasses are frozen, so the chain of objects along
+        the path is rebuilt from the leaf outwards with replace().
+        """
+        parts = _split_path(path)
+        chain = [self.config]
         for part in parts[:-1]:
-            obj = getattr(obj, part)
-        
-        setattr(obj, parts[-1], value)
+            chain.append(getattr(chain[-1], part))
+
+        for part in reversed(parts):
+            value = dataclasses.replace(chain.pop(), **{part: value})
+        self.config = value
     
     def save_config(self, config_file: Optional[str] = None) -> None:
-        """Save configuration to YAML file."""
+        """Save configuration to YAML (or JSON for .json paths)."""
         if config_file:
             self.config_file = config_file
-        
+
         config_dict = self._config_to_dict()
-        
+
         # Ensure directory exists
-        config_path = Path(self.config_file)
+        config_path = self._get_path()
         config_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(config_path, 'w') as f:
-            yaml.dump(config_dict, f, default_flow_style=False, indent=2)
+
+        if _wants_json(config_path):
+            with open(config_path, 'wb') as f:
+                f.write(_dump_json_bytes(config_dict))
+        else:
+            # Serialize in one shot and write the whole document with a
+            # single call instead of streaming small chunks through the
+            # emitter; the schema is fixed, so key sorting is skipped
+            yaml_mod, _, yaml_dumper = _get_yaml()
+            text = yaml_mod.dump(config_dict, Dumper=yaml_dumper,
+                                 default_flow_style=False, indent=2,
+                                 sort_keys=False)
+            with open(config_path, 'wb') as f:
+                f.write(text.encode('utf-8'))
     
     def _config_to_dict(self) -> Dict[str, Any]:
-        """Convert PiSwarmConfig to dictionary."""
-        return {
-            'version': self.config.version,
-            'cluster_name': self.config.cluster_name,
-            'deployment_mode': self.config.deployment_mode,
-            'network': {
-                'subnet': self.config.network.subnet,
-                'gateway': self.config.network.gateway,
-                'dns_servers': self.config.network.dns_servers,
-                'pi_ip_range': self.config.network.pi_ip_range,
-            },
-            'storage': {
-                'enable_shared_storage': self.config.storage.enable_shared_storage,
-                'storage_solution': self.config.storage.storage_solution,
-                'storage_path': self.config.storage.storage_path,
-                'auto_detect_ssd': self.config.storage.auto_detect_ssd,
-                'min_storage_size_gb': self.config.storage.min_storage_size_gb,
-            },
-            'dns': {
-                'enable_pihole': self.config.dns.enable_pihole,
-                'pihole_ip': self.config.dns.pihole_ip,
-                'domain': self.config.dns.domain,
-                'upstream_dns': self.config.dns.upstream_dns,
-                'admin_password': self.config.dns.admin_password,
-            },
-            'security': {
-                'enable_firewall': self.config.security.enable_firewall,
-                'ssh_port': self.config.security.ssh_port,
-                'disable_password_auth': self.config.security.disable_password_auth,
-                'enable_fail2ban': self.config.security.enable_fail2ban,
-                'ssl_cert_email': self.config.security.ssl_cert_email,
-            },
-            'monitoring': {
-                'enable_monitoring': self.config.monitoring.enable_monitoring,
-                'prometheus_retention': self.config.monitoring.prometheus_retention,
-                'grafana_admin_password': self.config.monitoring.grafana_admin_password,
-                'enable_alerts': self.config.monitoring.enable_alerts,
-                'alert_channels': self.config.monitoring.alert_channels,
-            }
-        }
+        """Convert PiSwarmConfig to dictionary.
+
+        dataclasses.asdict recurses through the section dataclasses in
+        field order, which matches the layout the manual builder
+        produced, and stays in sync when fields are added. Tuple-valued
+        fields (the shared defaults) are normalized to lists since
+        neither the YAML dumper nor orjson represents tuples.
+        """
+        result = dataclasses.asdict(self.config)
+        for section in result.values():
+            if isinstance(section, dict):
+                for key, value in section.items():
+                    if isinstance(value, tuple):
+                        section[key] = list(value)
+        return result
     
     def validate_config(self) -> List[str]:
         """Validate the current configuration."""
@@ -403,36 +616,25 @@ class ConfigManager:
     
     def get_config_summary(self) -> str:
         """Get a human-readable configuration summary."""
-        summary = f"""Pi-Swarm Configuration Summary
-================================
-
-Cluster: {self.config.cluster_name} (v{self.config.version})
-Mode: {self.config.deployment_mode}
-
-Network:
-  Subnet: {self.config.network.subnet}
-  Gateway: {self.config.network.gateway}
-  DNS Servers: {', '.join(self.config.network.dns_servers)}
-
-Storage:
-  Enabled: {self.config.storage.enable_shared_storage}
-  Solution: {self.config.storage.storage_solution}
-  Path: {self.config.storage.storage_path}
-
-DNS:
-  Pi-hole: {self.config.dns.enable_pihole}
-  Domain: {self.config.dns.domain}
-
-Security:
-  Firewall: {self.config.security.enable_firewall}
-  SSH Port: {self.config.security.ssh_port}
-  Fail2ban: {self.config.security.enable_fail2ban}
-
-Monitoring:
-  Enabled: {self.config.monitoring.enable_monitoring}
-  Alerts: {self.config.monitoring.enable_alerts}
-"""
-        return summary
+        config = self.config
+        return _SUMMARY_TEMPLATE.format_map({
+            'cluster_name': config.cluster_name,
+            'version': config.version,
+            'deployment_mode': config.deployment_mode,
+            'subnet': config.network.subnet,
+            'gateway': config.network.gateway,
+            'dns_list': ', '.join(config.network.dns_servers),
+            'storage_enabled': config.storage.enable_shared_storage,
+            'storage_solution': config.storage.storage_solution,
+            'storage_path': config.storage.storage_path,
+            'pihole_enabled': config.dns.enable_pihole,
+            'domain': config.dns.domain,
+            'firewall_enabled': config.security.enable_firewall,
+            'ssh_port': config.security.ssh_port,
+            'fail2ban_enabled': config.security.enable_fail2ban,
+            'monitoring_enabled': config.monitoring.enable_monitoring,
+            'alerts_enabled': config.monitoring.enable_alerts,
+        })
 
 
 def main():
@@ -483,10 +685,13 @@ def main():
         if not args.validate and not args.summary:
             # Output configuration
             if args.format == 'json':
-                print(json.dumps(config_manager._config_to_dict(), indent=2))
+                print(_dump_json_bytes(config_manager._config_to_dict()).decode('utf-8'))
             else:
+                yaml_mod, _, yaml_dumper = _get_yaml()
                 config_dict = config_manager._config_to_dict()
-                print(yaml.dump(config_dict, default_flow_style=False, indent=2))
+                print(yaml_mod.dump(config_dict, Dumper=yaml_dumper,
+                                    default_flow_style=False, indent=2,
+                                    sort_keys=False))
     
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
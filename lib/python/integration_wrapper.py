@@ -7,41 +7,107 @@ allowing gradual migration from Bash to Python while maintaining
 compatibility with existing deployment workflows.
 """
 
+import base64
+import functools
 import sys
 import os
 import json
+import socketserver
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
+# msgpack halves the payload size and skips textual JSON parsing for
+# callers that loop over many hosts; JSON stays the default wire format
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+# orjson speeds up the default JSON path the same way it does in the
+# config and monitoring modules
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Add lib/python to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from ssh_manager import SSHManager, SSHCredentials
 from directory_manager import DirectoryManager, DirectorySpec
-from service_orchestrator import ServiceOrchestrator
+
+
+# ssh_manager drags in paramiko (and tries asyncssh) and
+# service_orchestrator pulls yaml — 30-80ms of module init that a
+# dir-setup or dir-validate call never needs. Import them on first use;
+# lru_cache makes later calls a dict hit.
+@functools.lru_cache(maxsize=None)
+def _ssh_classes():
+    from ssh_manager import SSHManager, SSHCredentials, SSHConnectionPool
+    return SSHManager, SSHCredentials, SSHConnectionPool
+
+
+@functools.lru_cache(maxsize=None)
+def _orchestrator_class():
+    from service_orchestrator import ServiceOrchestrator
+    return ServiceOrchestrator
 
 
 class PiSwarmIntegrationWrapper:
     """Wrapper class that integrates Python modules with Bash workflows."""
-    
+
+    # How long an unused SSH manager survives in the cache; only
+    # relevant under the daemon, where the wrapper outlives many calls
+    _SSH_MANAGER_IDLE_SECONDS = 600
+
     def __init__(self, project_root: str = None):
         self.project_root = Path(project_root) if project_root else Path(__file__).parent.parent.parent
         self.ssh_manager = None
-        self.directory_manager = DirectoryManager()
+        self.directory_manager = DirectoryManager(str(self.project_root))
         self.service_orchestrator = None
-        
+        self._ssh_manager_cache = {}  # (username, hosts) -> (last_used, manager)
+        self._ssh_hosts = []
+        self._ssh_credentials = None
+
     def setup_ssh_manager(self, hosts: List[str], credentials: Dict[str, str]) -> bool:
-        """Initialize SSH manager with connection pool."""
+        """Initialize SSH manager with connection pool.
+
+        Managers are cached per (user, host set): a daemon serving a
+        Bash loop that re-issues ssh-setup per iteration keeps reusing
+        one pool — and its multiplexed connections — instead of
+        rebuilding it. Idle managers are reaped after a timeout.
+        """
         try:
+            SSHManager, SSHCredentials, SSHConnectionPool = _ssh_classes()
             creds = SSHCredentials(
                 username=credentials.get('username', 'pi'),
                 password=credentials.get('password'),
                 private_key_path=credentials.get('private_key_path'),
                 port=int(credentials.get('port', 22))
             )
-            
-            self.ssh_manager = SSHManager(hosts, creds)
+
+            key = (creds.username, tuple(sorted(hosts)))
+            now = time.time()
+            for stale in [k for k, (ts, _) in self._ssh_manager_cache.items()
+                          if now - ts > self._SSH_MANAGER_IDLE_SECONDS and k != key]:
+                del self._ssh_manager_cache[stale]
+
+            cached = self._ssh_manager_cache.get(key)
+            if cached:
+                self.ssh_manager = cached[1]
+            else:
+                # SSHManager wraps a connection pool; hosts and
+                # credentials are passed per call, so the wrapper keeps
+                # them for command fan-out
+                self.ssh_manager = SSHManager(SSHConnectionPool())
+            self._ssh_hosts = list(hosts)
+            self._ssh_credentials = creds
+            self._ssh_manager_cache[key] = (now, self.ssh_manager)
             return True
         except Exception as e:
             print(f"Error setting up SSH manager: {e}", file=sys.stderr)
@@ -61,7 +127,36 @@ class PiSwarmIntegrationWrapper:
             return {"success": True, "results": results}
         except Exception as e:
             return {"success": False, "error": str(e)}
-    
+
+    def execute_ssh_batch(self, commands: List[str], hosts: List[str] = None) -> Dict[str, Any]:
+        """Execute a command sequence in one SSH session per host.
+
+        Multi-step provisioning through execute_ssh_commands opens a
+        session per command per host; this ships the whole list as one
+        bash -s payload per host and splits the delimited results.
+        """
+        if not self.ssh_manager:
+            return {"success": False, "error": "SSH manager not initialized"}
+
+        targets = hosts or self._ssh_hosts
+        if not targets:
+            return {"success": False, "error": "No hosts configured"}
+
+        try:
+            # execute_batch lives on the connection pool and runs one
+            # host at a time, so fan the host list out across threads
+            pool = self.ssh_manager.pool
+            results = {}
+            with ThreadPoolExecutor(max_workers=min(16, len(targets))) as executor:
+                futures = {host: executor.submit(pool.execute_batch, host,
+                                                 commands, self._ssh_credentials)
+                           for host in targets}
+                for host, future in futures.items():
+                    results[host] = [asdict(result) for result in future.result()]
+            return {"success": True, "results": results}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
     def setup_directories(self, directory_specs: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Setup directory structure using Python directory manager."""
         try:
@@ -94,6 +189,8 @@ class PiSwarmIntegrationWrapper:
     def setup_service_orchestrator(self, swarm_manager: str, credentials: Dict[str, str]) -> bool:
         """Initialize service orchestrator."""
         try:
+            ServiceOrchestrator = _orchestrator_class()
+            _, SSHCredentials, _ = _ssh_classes()
             self.service_orchestrator = ServiceOrchestrator(
                 swarm_manager=swarm_manager,
                 ssh_credentials=SSHCredentials(
@@ -108,98 +205,217 @@ class PiSwarmIntegrationWrapper:
             return False
     
     def deploy_services(self, services: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Deploy services using Python orchestrator."""
+        """Deploy services using Python orchestrator.
+
+        Deployments are SSH/API-bound, so they run concurrently; a
+        failure in one service is captured in its slot rather than
+        aborting the batch.
+        """
         if not self.service_orchestrator:
             return {"success": False, "error": "Service orchestrator not initialized"}
-        
+
+        def deploy_one(service_config):
+            try:
+                return self.service_orchestrator.deploy_service(service_config)
+            except Exception as e:
+                return {"success": False, "error": str(e),
+                        "service": service_config.get('name', 'unknown')}
+
         try:
-            results = []
-            for service_config in services:
-                result = self.service_orchestrator.deploy_service(service_config)
-                results.append(result)
-            
+            if not services:
+                return {"success": True, "results": []}
+            with ThreadPoolExecutor(max_workers=min(16, len(services))) as executor:
+                results = list(executor.map(deploy_one, services))
             return {"success": True, "results": results}
         except Exception as e:
             return {"success": False, "error": str(e)}
-    
+
     def get_service_status(self, service_names: List[str] = None) -> Dict[str, Any]:
         """Get status of services."""
         if not self.service_orchestrator:
             return {"success": False, "error": "Service orchestrator not initialized"}
-        
+
+        def status_one(name):
+            try:
+                return self.service_orchestrator.get_service_status(name)
+            except Exception as e:
+                return {"success": False, "error": str(e)}
+
         try:
             if service_names:
-                results = {name: self.service_orchestrator.get_service_status(name) for name in service_names}
+                with ThreadPoolExecutor(max_workers=min(16, len(service_names))) as executor:
+                    results = dict(zip(service_names,
+                                       executor.map(status_one, service_names)))
             else:
                 results = self.service_orchestrator.list_services()
-            
+
             return {"success": True, "results": results}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
 
+# Wire commands and whether each positional payload is encoded; the
+# CLI decodes accordingly and the daemon receives them pre-decoded
+_COMMANDS = {
+    'ssh-setup': (True, True),
+    'ssh-execute': (True, True),
+    'ssh-batch': (True, True),
+    'dir-setup': (True,),
+    'dir-validate': (True,),
+    'service-setup': (False, True),
+    'service-deploy': (True,),
+    'service-status': (True,),
+}
+
+
+def _dispatch(wrapper: PiSwarmIntegrationWrapper, command: str,
+              args: List[Any]) -> Dict[str, Any]:
+    """Route one decoded command onto the wrapper."""
+    if command == 'ssh-setup':
+        return {"success": wrapper.setup_ssh_manager(args[0], args[1])}
+    if command == 'ssh-execute':
+        return wrapper.execute_ssh_commands(args[0], args[1] if len(args) > 1 else None)
+    if command == 'ssh-batch':
+        return wrapper.execute_ssh_batch(args[0], args[1] if len(args) > 1 else None)
+    if command == 'dir-setup':
+        return wrapper.setup_directories(args[0])
+    if command == 'dir-validate':
+        return wrapper.validate_directories(args[0])
+    if command == 'service-setup':
+        return {"success": wrapper.setup_service_orchestrator(args[0], args[1])}
+    if command == 'service-deploy':
+        return wrapper.deploy_services(args[0])
+    if command == 'service-status':
+        return wrapper.get_service_status(args[0] if args else None)
+    return {"success": False, "error": f"Unknown command: {command}"}
+
+
+def _dumps(result: Any) -> bytes:
+    if HAS_ORJSON:
+        return orjson.dumps(result)
+    return json.dumps(result).encode()
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    """One JSON request per line, one JSON reply per line."""
+
+    def handle(self):
+        for line in self.rfile:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+                result = _dispatch(self.server.wrapper,
+                                   request.get('command', ''),
+                                   request.get('args', []))
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+            self.wfile.write(_dumps(result) + b'\n')
+
+
+def run_daemon(socket_path: str) -> None:
+    """Serve wrapper commands over a unix socket.
+
+    A Bash loop that shells out per host pays interpreter startup and
+    the paramiko import on every call; the daemon keeps one
+    PiSwarmIntegrationWrapper (and therefore its SSH state) alive and
+    answers newline-delimited JSON requests, so each call is a socket
+    round-trip instead of a fork.
+    """
+    path = Path(socket_path)
+    if path.exists():
+        path.unlink()
+
+    class _Server(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+    server = _Server(socket_path, _DaemonHandler)
+    server.wrapper = PiSwarmIntegrationWrapper()
+    print(f"piswarm integration daemon listening on {socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+
+
+def _msgpack_loads(payload: str) -> Any:
+    """Decode a base64-wrapped msgpack payload from argv."""
+    return msgpack.unpackb(base64.b64decode(payload))
+
+
+def _msgpack_emit(result: Any) -> None:
+    """Write a msgpack result straight to the stdout byte stream."""
+    sys.stdout.buffer.write(msgpack.packb(result))
+
+
+def _json_emit(result: Any) -> None:
+    if HAS_ORJSON:
+        # orjson emits bytes directly, skipping the UTF-8 re-encode
+        sys.stdout.buffer.write(orjson.dumps(result) + b'\n')
+    else:
+        print(json.dumps(result))
+
+
 def main():
     """CLI interface for the integration wrapper."""
-    if len(sys.argv) < 2:
-        print("Usage: python3 integration_wrapper.py <command> [args...]")
+    args = sys.argv[1:]
+
+    if args and args[0] == '--daemon':
+        if len(args) < 2:
+            print("Usage: python3 integration_wrapper.py --daemon <socket_path>",
+                  file=sys.stderr)
+            sys.exit(1)
+        run_daemon(args[1])
+        return
+
+    # --msgpack switches the wire format: argv payloads arrive as
+    # base64-wrapped msgpack and the result is emitted as raw msgpack
+    # bytes, skipping textual JSON parsing on both sides of the pipe
+    use_msgpack = bool(args) and args[0] == '--msgpack'
+    if use_msgpack:
+        args = args[1:]
+        if not HAS_MSGPACK:
+            print(json.dumps({"success": False, "error": "msgpack is not installed"}))
+            sys.exit(1)
+        loads, emit = _msgpack_loads, _msgpack_emit
+    else:
+        loads = orjson.loads if HAS_ORJSON else json.loads
+        emit = _json_emit
+
+    if not args:
+        print("Usage: python3 integration_wrapper.py [--msgpack] <command> [args...]")
+        print("       python3 integration_wrapper.py --daemon <socket_path>")
         print("\nCommands:")
         print("  ssh-setup <hosts_json> <credentials_json>")
         print("  ssh-execute <commands_json> [hosts_json]")
+        print("  ssh-batch <commands_json> [hosts_json]")
         print("  dir-setup <specs_json>")
         print("  dir-validate <paths_json>")
         print("  service-setup <manager> <credentials_json>")
         print("  service-deploy <services_json>")
         print("  service-status [names_json]")
+        print("\nWith --msgpack, payload arguments are base64-encoded")
+        print("msgpack and results are emitted as msgpack bytes.")
+        print("With --daemon, commands are served as newline-delimited")
+        print("JSON ({\"command\": ..., \"args\": [...]}) on a unix socket.")
         sys.exit(1)
-    
+
+    command = args[0]
+    if command not in _COMMANDS:
+        print(f"Unknown command: {command}", file=sys.stderr)
+        sys.exit(1)
+
     wrapper = PiSwarmIntegrationWrapper()
-    command = sys.argv[1]
-    
     try:
-        if command == "ssh-setup":
-            hosts = json.loads(sys.argv[2])
-            credentials = json.loads(sys.argv[3])
-            success = wrapper.setup_ssh_manager(hosts, credentials)
-            print(json.dumps({"success": success}))
-        
-        elif command == "ssh-execute":
-            commands = json.loads(sys.argv[2])
-            hosts = json.loads(sys.argv[3]) if len(sys.argv) > 3 else None
-            result = wrapper.execute_ssh_commands(commands, hosts)
-            print(json.dumps(result))
-        
-        elif command == "dir-setup":
-            specs = json.loads(sys.argv[2])
-            result = wrapper.setup_directories(specs)
-            print(json.dumps(result))
-        
-        elif command == "dir-validate":
-            paths = json.loads(sys.argv[2])
-            result = wrapper.validate_directories(paths)
-            print(json.dumps(result))
-        
-        elif command == "service-setup":
-            manager = sys.argv[2]
-            credentials = json.loads(sys.argv[3])
-            success = wrapper.setup_service_orchestrator(manager, credentials)
-            print(json.dumps({"success": success}))
-        
-        elif command == "service-deploy":
-            services = json.loads(sys.argv[2])
-            result = wrapper.deploy_services(services)
-            print(json.dumps(result))
-        
-        elif command == "service-status":
-            names = json.loads(sys.argv[2]) if len(sys.argv) > 2 else None
-            result = wrapper.get_service_status(names)
-            print(json.dumps(result))
-        
-        else:
-            print(f"Unknown command: {command}", file=sys.stderr)
-            sys.exit(1)
-    
+        decoded = [loads(value) if decode else value
+                   for value, decode in zip(args[1:], _COMMANDS[command])]
+        emit(_dispatch(wrapper, command, decoded))
     except Exception as e:
-        print(json.dumps({"success": False, "error": str(e)}))
+        emit({"success": False, "error": str(e)})
         sys.exit(1)
 
 
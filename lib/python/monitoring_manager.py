@@ -5,18 +5,238 @@ Handles performance monitoring, alerting, and health checks
 """
 
 import argparse
+import copy
+import functools
+import io
 import json
 import logging
 import os
+import pickle
+import string
 import subprocess
 import sys
+import tarfile
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 import requests
 import yaml
 from pathlib import Path
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+if HAS_ORJSON:
+    _json_loads = orjson.loads
+else:
+    _json_loads = json.loads
+
+# libyaml C accelerator when PyYAML was built with it
+_YAML_SAFE_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YAML_SAFE_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# Static alert rule structure; only the three threshold expressions vary
+# (filled in by _build_prometheus_rules)
+_ALERT_RULES_TEMPLATE = {
+    'groups': [
+        {
+            'name': 'pi-swarm-alerts',
+            'rules': [
+                {
+                    'alert': 'HighCPUUsage',
+                    'expr': 'cpu_usage_percent > {cpu_threshold}',
+                    'for': '5m',
+                    'labels': {'severity': 'warning'},
+                    'annotations': {
+                        'summary': 'High CPU usage detected',
+                        'description': 'CPU usage is above {{ $value }}%'
+                    }
+                },
+                {
+                    'alert': 'HighMemoryUsage',
+                    'expr': 'memory_usage_percent > {memory_threshold}',
+                    'for': '5m',
+                    'labels': {'severity': 'warning'},
+                    'annotations': {
+                        'summary': 'High memory usage detected',
+                        'description': 'Memory usage is above {{ $value }}%'
+                    }
+                },
+                {
+                    'alert': 'HighDiskUsage',
+                    'expr': 'disk_usage_percent > {disk_threshold}',
+                    'for': '5m',
+                    'labels': {'severity': 'critical'},
+                    'annotations': {
+                        'summary': 'High disk usage detected',
+                        'description': 'Disk usage is above {{ $value }}%'
+                    }
+                },
+                {
+                    'alert': 'ServiceDown',
+                    'expr': 'docker_service_running == 0',
+                    'for': '1m',
+                    'labels': {'severity': 'critical'},
+                    'annotations': {
+                        'summary': 'Docker service is down',
+                        'description': 'Service {{ $labels.service_name }} is not running'
+                    }
+                },
+                {
+                    'alert': 'NodeDown',
+                    'expr': 'docker_node_status != 1',
+                    'for': '2m',
+                    'labels': {'severity': 'critical'},
+                    'annotations': {
+                        'summary': 'Docker node is down',
+                        'description': 'Node {{ $labels.node_name }} is not available'
+                    }
+                }
+            ]
+        }
+    ]
+}
+
+
+# Pre-serialized YAML form of _ALERT_RULES_TEMPLATE; create_alerts only
+# substitutes the thresholds, skipping the YAML emitter entirely.
+# $value/$labels are Prometheus template refs and are left untouched by
+# safe_substitute. Keep in sync with _ALERT_RULES_TEMPLATE above.
+_ALERTS_YAML_TEMPLATE = string.Template("""\
+groups:
+- name: pi-swarm-alerts
+  rules:
+  - alert: HighCPUUsage
+    annotations:
+      description: CPU usage is above {{ $value }}%
+      summary: High CPU usage detected
+    expr: cpu_usage_percent > $cpu_threshold
+    for: 5m
+    labels:
+      severity: warning
+  - alert: HighMemoryUsage
+    annotations:
+      description: Memory usage is above {{ $value }}%
+      summary: High memory usage detected
+    expr: memory_usage_percent > $memory_threshold
+    for: 5m
+    labels:
+      severity: warning
+  - alert: HighDiskUsage
+    annotations:
+      description: Disk usage is above {{ $value }}%
+      summary: High disk usage detected
+    expr: disk_usage_percent > $disk_threshold
+    for: 5m
+    labels:
+      severity: critical
+  - alert: ServiceDown
+    annotations:
+      description: Service {{ $labels.service_name }} is not running
+      summary: Docker service is down
+    expr: docker_service_running == 0
+    for: 1m
+    labels:
+      severity: critical
+  - alert: NodeDown
+    annotations:
+      description: Node {{ $labels.node_name }} is not available
+      summary: Docker node is down
+    expr: docker_node_status != 1
+    for: 2m
+    labels:
+      severity: critical
+""")
+
+
+@functools.lru_cache(maxsize=8)
+def _build_prometheus_rules(cpu_threshold: int, memory_threshold: int,
+                            disk_threshold: int) -> Dict:
+    """Fill the alert rule template with thresholds, cached per threshold tuple"""
+    rules = copy.deepcopy(_ALERT_RULES_TEMPLATE)
+    thresholds = {
+        'cpu_threshold': cpu_threshold,
+        'memory_threshold': memory_threshold,
+        'disk_threshold': disk_threshold
+    }
+    for rule in rules['groups'][0]['rules']:
+        if '{' in rule['expr']:
+            rule['expr'] = rule['expr'].format(**thresholds)
+    return rules
+
+
+@functools.lru_cache(maxsize=1)
+def _ts_filename(sec: int) -> str:
+    """Timestamp string for default filenames, cached per second.
+
+    strftime pays localization lookups on every call; filename
+    generation only needs second precision so repeat calls within the
+    same second reuse the last result.
+    """
+    return datetime.fromtimestamp(sec).strftime('%Y%m%d_%H%M%S')
+
+
+def _replicas_healthy(replicas: str) -> bool:
+    """Check a docker 'N/M' replica string for N == M and N > 0.
+
+    Pure byte comparison — no split, no int parse — since this runs once
+    per service on every health check.
+    """
+    idx = replicas.find('/')
+    return idx > 0 and replicas[:idx] == replicas[idx + 1:] and replicas[0] != '0'
+
+
+# Only these top-level keys are kept from Docker payloads: inspect
+# output carries hundreds of fields, while the health checks, dashboard
+# and saved metrics use just a handful, so dropping the rest cuts both
+# parse-result memory and serialization cost
+_CLUSTER_INFO_FIELDS = frozenset({
+    'ID', 'Name', 'ServerVersion', 'OperatingSystem', 'OSType',
+    'Architecture', 'NCPU', 'MemTotal', 'Containers', 'ContainersRunning',
+    'ContainersPaused', 'ContainersStopped', 'Images', 'Swarm', 'Warnings'
+})
+_NODE_FIELDS = frozenset({
+    'ID', 'Hostname', 'Status', 'Spec', 'Description', 'ManagerStatus',
+    'Availability', 'EngineVersion', 'Self', 'TLSInfo'
+})
+_SERVICE_FIELDS = frozenset({
+    'ID', 'Name', 'Replicas', 'Image', 'Mode', 'Ports', 'Spec',
+    'Endpoint', 'ServiceStatus', 'UpdateStatus', 'CreatedAt', 'UpdatedAt'
+})
+_NETWORK_FIELDS = frozenset({
+    'ID', 'Name', 'Driver', 'Scope', 'Internal', 'Attachable', 'Ingress',
+    'IPAM', 'Peers', 'Services', 'Containers', 'Labels', 'Created'
+})
+
+
+def _keep_fields(payload: Dict, fields: frozenset) -> Dict:
+    """Drop payload keys outside the whitelist"""
+    return {k: v for k, v in payload.items() if k in fields}
+
+
+def _normalize_cli_node(node: Dict) -> Dict:
+    """Map a `docker node ls` record onto the Engine API node shape.
+
+    The CLI emits flat strings ('Status': 'Ready', 'Availability':
+    'Active') while the API nests them ('Status': {'State': 'ready'},
+    'Spec': {'Availability': 'active'}); the health checks and the
+    dashboard consume the API form, so both fetch paths must hand back
+    one canonical shape.
+    """
+    status = node.get('Status')
+    if isinstance(status, str):
+        node['Status'] = {'State': status.lower()}
+    availability = node.get('Availability')
+    if isinstance(availability, str) and not isinstance(node.get('Spec'), dict):
+        node['Spec'] = {'Availability': availability.lower()}
+    return node
+
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,231 +247,355 @@ logger = logging.getLogger(__name__)
 class MonitoringManager:
     """Comprehensive monitoring and alerting system"""
     
-    def __init__(self, config_path: str = None):
+    def __init__(self, config_path: str = None, cache_ttl: float = 10.0):
         """Initialize monitoring manager"""
         self.config_path = config_path or "/home/luser/PI-Swarm/config/config.yml"
         self.config = self._load_config()
+        self.cache_ttl = cache_ttl
         self.metrics_cache = {}
         self.alerts_cache = []
+        self._api_session = None
+        self._metrics_cache_ts = 0.0
+        self._last_dash_hash = None
+        # Shared env for docker CLI fallbacks: hint/buildkit lookups add
+        # measurable startup time to every invocation
+        self._docker_env = {**os.environ, 'DOCKER_CLI_HINTS': 'false', 'DOCKER_BUILDKIT': '0'}
+        self._docker_cmd_bases = {}
+
+    def _docker_cmd(self, manager_ip: str, *args: str) -> Tuple[str, ...]:
+        """Build a docker CLI argv tuple, memoizing the base per manager"""
+        base = self._docker_cmd_bases.get(manager_ip)
+        if base is None:
+            base = ('docker', '-H', f'{manager_ip}:2376')
+            self._docker_cmd_bases[manager_ip] = base
+        return base + args
         
     def _load_config(self) -> Dict:
-        """Load configuration from YAML file"""
+        """Load configuration from YAML file.
+
+        The parsed config is cached in a pickle sidecar keyed on the
+        YAML file's mtime, so repeated CLI invocations skip the YAML
+        parse entirely while edits to the file still take effect.
+        """
         try:
-            if os.path.exists(self.config_path):
-                with open(self.config_path, 'r') as f:
-                    return yaml.safe_load(f) or {}
-            return {}
+            if not os.path.exists(self.config_path):
+                return {}
+
+            mtime = os.stat(self.config_path).st_mtime
+            cache_path = self.config_path + '.cache.pkl'
+
+            try:
+                with open(cache_path, 'rb') as f:
+                    cached_mtime, config = pickle.load(f)
+                if cached_mtime == mtime:
+                    return config
+            except (OSError, pickle.PickleError, ValueError, EOFError):
+                pass
+
+            with open(self.config_path, 'r') as f:
+                config = yaml.load(f, Loader=_YAML_SAFE_LOADER) or {}
+
+            try:
+                with open(cache_path, 'wb') as f:
+                    pickle.dump((mtime, config), f)
+            except OSError:
+                pass  # Cache is best-effort; a read-only config dir is fine
+
+            return config
         except Exception as e:
-            logger.warning(f"Could not load config: {e}")
+            logger.warning("Could not load config: %s", e)
             return {}
+
+    def _get_tls_config(self) -> Optional[Dict]:
+        """Get Docker Engine TLS client configuration, if configured"""
+        tls = self.config.get('swarm', {}).get('tls', {})
+        if tls.get('cert') and tls.get('key') and tls.get('ca'):
+            return tls
+        return None
+
+    def _get_api_session(self) -> Optional[requests.Session]:
+        """Get the persistent Docker Engine API session, creating it lazily.
+
+        A single Session reuses one TCP/TLS connection across all API
+        calls in a collection cycle instead of paying a fresh handshake
+        per request. Returns None when TLS client credentials are not
+        configured.
+        """
+        if self._api_session is not None:
+            return self._api_session
+
+        tls = self._get_tls_config()
+        if not tls:
+            return None
+
+        session = requests.Session()
+        session.cert = (tls['cert'], tls['key'])
+        session.verify = tls['ca']
+        self._api_session = session
+        return session
+
+    def _api_get(self, manager_ip: str, endpoint: str) -> Optional[Any]:
+        """Query the Docker Engine REST API directly over TLS.
+
+        Returns the parsed JSON response, or None when TLS client
+        credentials are not configured or the request fails (callers
+        fall back to the docker CLI in that case).
+        """
+        session = self._get_api_session()
+        if session is None:
+            return None
+
+        try:
+            response = session.get(
+                f"https://{manager_ip}:2376{endpoint}", timeout=30
+            )
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.warning("Docker API request failed for %s: %s", endpoint, e)
+            return None
     
-    def collect_cluster_metrics(self, manager_ip: str, output_file: str = None) -> Dict[str, Any]:
-        """Collect comprehensive cluster performance metrics"""
-        logger.info("🔍 Collecting cluster performance metrics...")
-        
+    def collect_cluster_metrics(self, manager_ip: str, output_file: str = None,
+                                pretty: bool = False) -> Dict[str, Any]:
+        """Collect cluster performance metrics and save them to a file"""
         if not output_file:
-            output_file = f"cluster-performance-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        
-        metrics = {
-            'timestamp': datetime.now().isoformat(),
-            'cluster_info': self._get_cluster_info(manager_ip),
-            'node_metrics': self._get_node_metrics(manager_ip),
-            'service_metrics': self._get_service_metrics(manager_ip),
-            'resource_usage': self._get_resource_usage(manager_ip),
-            'network_metrics': self._get_network_metrics(manager_ip),
-            'health_status': self._get_health_status(manager_ip)
+            output_file = f"cluster-performance-{_ts_filename(int(time.time()))}.json"
+
+        metrics = self._collect_metrics_dict(manager_ip)
+        self.save_metrics(metrics, output_file, pretty=pretty)
+        return metrics
+
+    def _collect_metrics_dict(self, manager_ip: str) -> Dict[str, Any]:
+        """Collect comprehensive cluster performance metrics.
+
+        Results are cached for cache_ttl seconds so back-to-back callers
+        (e.g. a health dashboard followed by an optimize pass) reuse one
+        set of Docker queries instead of re-collecting.
+        """
+        if self.metrics_cache and time.time() - self._metrics_cache_ts < self.cache_ttl:
+            return self.metrics_cache
+
+        logger.info("🔍 Collecting cluster performance metrics...")
+
+        # The collectors are independent I/O calls, so run them concurrently:
+        # wall time collapses from the sum of all calls to the slowest one
+        collectors = {
+            'cluster_info': self._get_cluster_info,
+            'node_metrics': self._get_node_metrics,
+            'service_metrics': self._get_service_metrics,
+            'resource_usage': self._get_resource_usage,
+            'network_metrics': self._get_network_metrics
         }
+
+        metrics = {'timestamp': datetime.now().isoformat()}
+        with ThreadPoolExecutor(max_workers=len(collectors)) as executor:
+            futures = {name: executor.submit(collector, manager_ip)
+                       for name, collector in collectors.items()}
+            for name, future in futures.items():
+                metrics[name] = future.result()
+
+        # Health status reuses the freshly fetched lists instead of
+        # re-querying Docker
+        metrics['health_status'] = self._compute_health_status(
+            metrics['node_metrics'], metrics['service_metrics']
+        )
         
         # Cache metrics
         self.metrics_cache = metrics
-        
-        # Save to file
+        self._metrics_cache_ts = time.time()
+
+        return metrics
+
+    def save_metrics(self, metrics: Dict[str, Any], output_file: str,
+                     pretty: bool = False) -> bool:
+        """Save a collected metrics dict to a JSON file.
+
+        Writes compact JSON to a sibling tempfile and renames it into
+        place, so readers never see a partially written file and the
+        default output is roughly a third of the indented size. Pass
+        pretty=True for human-readable indented output.
+        """
+        tmp_file = output_file + '.tmp'
         try:
-            with open(output_file, 'w') as f:
-                json.dump(metrics, f, indent=2)
-            logger.info(f"📊 Metrics saved to: {output_file}")
+            if HAS_ORJSON:
+                data = orjson.dumps(metrics, option=orjson.OPT_INDENT_2 if pretty else 0)
+            elif pretty:
+                data = json.dumps(metrics, indent=2).encode()
+            else:
+                data = json.dumps(metrics, separators=(',', ':')).encode()
+
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_file, output_file)
+            logger.info("📊 Metrics saved to: %s", output_file)
+            return True
         except Exception as e:
-            logger.error(f"Failed to save metrics: {e}")
-        
-        return metrics
+            logger.error("Failed to save metrics: %s", e)
+            try:
+                os.unlink(tmp_file)
+            except OSError:
+                pass
+            return False
     
     def _get_cluster_info(self, manager_ip: str) -> Dict:
         """Get Docker Swarm cluster information"""
+        info = self._api_get(manager_ip, '/info')
+        if info is not None:
+            return _keep_fields(info, _CLUSTER_INFO_FIELDS)
+
         try:
-            result = subprocess.run([
-                'docker', '-H', f'{manager_ip}:2376', 'info', '--format', '{{json .}}'
-            ], capture_output=True, text=True, timeout=30)
+            result = subprocess.run(
+                self._docker_cmd(manager_ip, 'info', '--format', '{{json .}}'),
+                capture_output=True, text=True, timeout=30, env=self._docker_env)
             
             if result.returncode == 0:
-                return json.loads(result.stdout)
+                return _keep_fields(_json_loads(result.stdout), _CLUSTER_INFO_FIELDS)
             else:
-                logger.warning(f"Failed to get cluster info: {result.stderr}")
+                logger.warning("Failed to get cluster info: %s", result.stderr)
                 return {}
         except Exception as e:
-            logger.error(f"Error getting cluster info: {e}")
+            logger.error("Error getting cluster info: %s", e)
             return {}
     
     def _get_node_metrics(self, manager_ip: str) -> List[Dict]:
         """Get metrics for all nodes in the cluster"""
+        # One API call returns the full inspect payload for every node,
+        # avoiding one docker subprocess per node
+        nodes = self._api_get(manager_ip, '/nodes')
+        if nodes is not None:
+            for node in nodes:
+                # CLI-compatible key expected by health checks and the dashboard
+                node.setdefault('Hostname', node.get('Description', {}).get('Hostname', ''))
+            return [_keep_fields(node, _NODE_FIELDS) for node in nodes]
+
         try:
-            result = subprocess.run([
-                'docker', '-H', f'{manager_ip}:2376', 'node', 'ls', '--format', '{{json .}}'
-            ], capture_output=True, text=True, timeout=30)
-            
+            result = subprocess.run(
+                self._docker_cmd(manager_ip, 'node', 'ls', '--format', '{{json .}}'),
+                capture_output=True, text=True, timeout=30, env=self._docker_env)
+
             if result.returncode == 0:
                 nodes = []
-                for line in result.stdout.strip().split('\n'):
+                for line in result.stdout.splitlines():
                     if line:
-                        node_data = json.loads(line)
-                        # Get detailed node info
-                        node_detail = self._get_node_detail(manager_ip, node_data.get('ID'))
-                        node_data.update(node_detail)
-                        nodes.append(node_data)
+                        nodes.append(_normalize_cli_node(_json_loads(line)))
                 return nodes
             else:
-                logger.warning(f"Failed to get node metrics: {result.stderr}")
+                logger.warning("Failed to get node metrics: %s", result.stderr)
                 return []
         except Exception as e:
-            logger.error(f"Error getting node metrics: {e}")
+            logger.error("Error getting node metrics: %s", e)
             return []
-    
-    def _get_node_detail(self, manager_ip: str, node_id: str) -> Dict:
-        """Get detailed information for a specific node"""
-        try:
-            result = subprocess.run([
-                'docker', '-H', f'{manager_ip}:2376', 'node', 'inspect', node_id, '--format', '{{json .}}'
-            ], capture_output=True, text=True, timeout=30)
-            
-            if result.returncode == 0:
-                return json.loads(result.stdout)
-            return {}
-        except Exception as e:
-            logger.error(f"Error getting node detail: {e}")
-            return {}
-    
+
     def _get_service_metrics(self, manager_ip: str) -> List[Dict]:
         """Get metrics for all services in the cluster"""
+        # status=true makes the API include ServiceStatus task counts,
+        # which the CLI's Replicas column is derived from
+        services = self._api_get(manager_ip, '/services?status=true')
+        if services is not None:
+            for service in services:
+                # CLI-compatible keys expected by health checks and the dashboard
+                service.setdefault('Name', service.get('Spec', {}).get('Name', ''))
+                if 'Replicas' not in service:
+                    status = service.get('ServiceStatus') or {}
+                    running = status.get('RunningTasks', 0)
+                    desired = status.get('DesiredTasks')
+                    if desired is None:
+                        desired = (service.get('Spec', {}).get('Mode', {})
+                                   .get('Replicated', {}).get('Replicas', 0))
+                    service['Replicas'] = f"{running}/{desired}"
+            return [_keep_fields(service, _SERVICE_FIELDS) for service in services]
+
         try:
-            result = subprocess.run([
-                'docker', '-H', f'{manager_ip}:2376', 'service', 'ls', '--format', '{{json .}}'
-            ], capture_output=True, text=True, timeout=30)
-            
+            result = subprocess.run(
+                self._docker_cmd(manager_ip, 'service', 'ls', '--format', '{{json .}}'),
+                capture_output=True, text=True, timeout=30, env=self._docker_env)
+
             if result.returncode == 0:
                 services = []
-                for line in result.stdout.strip().split('\n'):
+                for line in result.stdout.splitlines():
                     if line:
-                        service_data = json.loads(line)
-                        # Get detailed service info
-                        service_detail = self._get_service_detail(manager_ip, service_data.get('ID'))
-                        service_data.update(service_detail)
-                        services.append(service_data)
+                        services.append(_json_loads(line))
                 return services
             else:
-                logger.warning(f"Failed to get service metrics: {result.stderr}")
+                logger.warning("Failed to get service metrics: %s", result.stderr)
                 return []
         except Exception as e:
-            logger.error(f"Error getting service metrics: {e}")
+            logger.error("Error getting service metrics: %s", e)
             return []
     
-    def _get_service_detail(self, manager_ip: str, service_id: str) -> Dict:
-        """Get detailed information for a specific service"""
-        try:
-            result = subprocess.run([
-                'docker', '-H', f'{manager_ip}:2376', 'service', 'inspect', service_id, '--format', '{{json .}}'
-            ], capture_output=True, text=True, timeout=30)
-            
-            if result.returncode == 0:
-                return json.loads(result.stdout)
-            return {}
-        except Exception as e:
-            logger.error(f"Error getting service detail: {e}")
-            return {}
-    
     def _get_resource_usage(self, manager_ip: str) -> Dict:
         """Get resource usage statistics"""
+        usage = self._api_get(manager_ip, '/system/df')
+        if usage is not None:
+            return usage
+
         try:
             # Get stats from Docker API
-            result = subprocess.run([
-                'docker', '-H', f'{manager_ip}:2376', 'system', 'df', '--format', '{{json .}}'
-            ], capture_output=True, text=True, timeout=30)
+            result = subprocess.run(
+                self._docker_cmd(manager_ip, 'system', 'df', '--format', '{{json .}}'),
+                capture_output=True, text=True, timeout=30, env=self._docker_env)
             
             if result.returncode == 0:
-                return json.loads(result.stdout)
+                return _json_loads(result.stdout)
             return {}
         except Exception as e:
-            logger.error(f"Error getting resource usage: {e}")
+            logger.error("Error getting resource usage: %s", e)
             return {}
     
     def _get_network_metrics(self, manager_ip: str) -> List[Dict]:
         """Get network metrics for the cluster"""
+        networks = self._api_get(manager_ip, '/networks?verbose=true')
+        if networks is not None:
+            return [_keep_fields(network, _NETWORK_FIELDS) for network in networks]
+
         try:
-            result = subprocess.run([
-                'docker', '-H', f'{manager_ip}:2376', 'network', 'ls', '--format', '{{json .}}'
-            ], capture_output=True, text=True, timeout=30)
-            
+            result = subprocess.run(
+                self._docker_cmd(manager_ip, 'network', 'ls', '--format', '{{json .}}'),
+                capture_output=True, text=True, timeout=30, env=self._docker_env)
+
             if result.returncode == 0:
                 networks = []
-                for line in result.stdout.strip().split('\n'):
+                for line in result.stdout.splitlines():
                     if line:
-                        network_data = json.loads(line)
-                        # Get detailed network info
-                        network_detail = self._get_network_detail(manager_ip, network_data.get('ID'))
-                        network_data.update(network_detail)
-                        networks.append(network_data)
+                        networks.append(_json_loads(line))
                 return networks
             return []
         except Exception as e:
-            logger.error(f"Error getting network metrics: {e}")
+            logger.error("Error getting network metrics: %s", e)
             return []
     
-    def _get_network_detail(self, manager_ip: str, network_id: str) -> Dict:
-        """Get detailed information for a specific network"""
-        try:
-            result = subprocess.run([
-                'docker', '-H', f'{manager_ip}:2376', 'network', 'inspect', network_id, '--format', '{{json .}}'
-            ], capture_output=True, text=True, timeout=30)
-            
-            if result.returncode == 0:
-                return json.loads(result.stdout)
-            return {}
-        except Exception as e:
-            logger.error(f"Error getting network detail: {e}")
-            return {}
-    
-    def _get_health_status(self, manager_ip: str) -> Dict:
-        """Get overall cluster health status"""
+    def _compute_health_status(self, nodes: List[Dict], services: List[Dict]) -> Dict:
+        """Compute cluster health status from already-fetched metrics"""
         health = {
             'status': 'healthy',
             'issues': [],
             'recommendations': []
         }
-        
+
         try:
             # Check node health
-            nodes = self._get_node_metrics(manager_ip)
-            for node in nodes:
-                status = node.get('Status', {})
-                if status.get('State') != 'ready':
-                    health['status'] = 'warning'
-                    health['issues'].append(f"Node {node.get('Hostname')} is not ready")
-            
+            not_ready = [node.get('Hostname') for node in nodes
+                         if node.get('Status', {}).get('State') != 'ready']
+            health['issues'].extend(f"Node {hostname} is not ready" for hostname in not_ready)
+
             # Check service health
-            services = self._get_service_metrics(manager_ip)
-            for service in services:
-                replicas = service.get('Replicas', '0/0')
-                if '/' in replicas:
-                    current, desired = replicas.split('/')
-                    if current != desired:
-                        health['status'] = 'warning'
-                        health['issues'].append(f"Service {service.get('Name')} has {current}/{desired} replicas")
-            
+            degraded = [(service.get('Name'), service.get('Replicas', '0/0'))
+                        for service in services
+                        if '/' in service.get('Replicas', '0/0')
+                        and not _replicas_healthy(service.get('Replicas', '0/0'))]
+            health['issues'].extend(f"Service {name} has {replicas} replicas"
+                                    for name, replicas in degraded)
+
+            if health['issues']:
+                health['status'] = 'warning'
+
             # Add recommendations based on issues
             if health['issues']:
                 health['recommendations'].append("Check service logs for error details")
                 health['recommendations'].append("Verify node connectivity and resources")
         
         except Exception as e:
-            logger.error(f"Error getting health status: {e}")
+            logger.error("Error getting health status: %s", e)
             health['status'] = 'error'
             health['issues'].append(f"Health check failed: {e}")
         
@@ -274,185 +618,117 @@ class MonitoringManager:
             default_alerts.update(alert_config)
         
         try:
-            # Create Prometheus alert rules
-            alert_rules = self._create_prometheus_rules(default_alerts)
-            
-            # Save alert rules
+            # The rule set is static apart from three thresholds, so the
+            # YAML is pre-serialized as a template and only the
+            # thresholds are substituted — no YAML emitter on this path
             alert_file = "/home/luser/PI-Swarm/config/prometheus-alerts.yml"
             with open(alert_file, 'w') as f:
-                yaml.dump(alert_rules, f, default_flow_style=False)
-            
-            logger.info(f"📋 Alert rules saved to: {alert_file}")
+                f.write(_ALERTS_YAML_TEMPLATE.safe_substitute(default_alerts))
+
+            logger.info("📋 Alert rules saved to: %s", alert_file)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to create alerts: {e}")
+            logger.error("Failed to create alerts: %s", e)
             return False
     
     def _create_prometheus_rules(self, config: Dict) -> Dict:
         """Create Prometheus alert rules configuration"""
-        return {
-            'groups': [
-                {
-                    'name': 'pi-swarm-alerts',
-                    'rules': [
-                        {
-                            'alert': 'HighCPUUsage',
-                            'expr': f'cpu_usage_percent > {config["cpu_threshold"]}',
-                            'for': '5m',
-                            'labels': {'severity': 'warning'},
-                            'annotations': {
-                                'summary': 'High CPU usage detected',
-                                'description': 'CPU usage is above {{ $value }}%'
-                            }
-                        },
-                        {
-                            'alert': 'HighMemoryUsage',
-                            'expr': f'memory_usage_percent > {config["memory_threshold"]}',
-                            'for': '5m',
-                            'labels': {'severity': 'warning'},
-                            'annotations': {
-                                'summary': 'High memory usage detected',
-                                'description': 'Memory usage is above {{ $value }}%'
-                            }
-                        },
-                        {
-                            'alert': 'HighDiskUsage',
-                            'expr': f'disk_usage_percent > {config["disk_threshold"]}',
-                            'for': '5m',
-                            'labels': {'severity': 'critical'},
-                            'annotations': {
-                                'summary': 'High disk usage detected',
-                                'description': 'Disk usage is above {{ $value }}%'
-                            }
-                        },
-                        {
-                            'alert': 'ServiceDown',
-                            'expr': 'docker_service_running == 0',
-                            'for': '1m',
-                            'labels': {'severity': 'critical'},
-                            'annotations': {
-                                'summary': 'Docker service is down',
-                                'description': 'Service {{ $labels.service_name }} is not running'
-                            }
-                        },
-                        {
-                            'alert': 'NodeDown',
-                            'expr': 'docker_node_status != 1',
-                            'for': '2m',
-                            'labels': {'severity': 'critical'},
-                            'annotations': {
-                                'summary': 'Docker node is down',
-                                'description': 'Node {{ $labels.node_name }} is not available'
-                            }
-                        }
-                    ]
-                }
-            ]
-        }
+        return _build_prometheus_rules(
+            config['cpu_threshold'], config['memory_threshold'], config['disk_threshold']
+        )
     
-    def optimize_performance(self, manager_ip: str, optimization_level: str = 'standard') -> Dict:
-        """Apply performance optimizations to the cluster"""
+    def optimize_performance(self, manager_ip: str, optimization_level: str = 'standard',
+                             include_noop: bool = False) -> Dict:
+        """Apply performance optimizations to the cluster.
+
+        Optimizers come from registries of (label, method) pairs, so
+        adding a real implementation only means adding a registry entry.
+        Placeholder optimizers (marked _noop) are skipped unless
+        include_noop is set.
+        """
         logger.info("🔧 Applying performance optimizations...")
-        
+
         optimizations = {
             'applied': [],
             'failed': [],
             'recommendations': []
         }
-        
+
+        registry = list(self._standard_optimizers())
+        if optimization_level == 'aggressive':
+            registry.extend(self._aggressive_optimizers())
+
         try:
-            # Get current metrics
-            metrics = self.collect_cluster_metrics(manager_ip)
-            
-            if optimization_level == 'aggressive':
-                # Aggressive optimizations
-                optimizations['applied'].extend(self._apply_aggressive_optimizations(manager_ip, metrics))
-            else:
-                # Standard optimizations
-                optimizations['applied'].extend(self._apply_standard_optimizations(manager_ip, metrics))
-            
-            # Generate recommendations
+            for label, optimizer in registry:
+                if getattr(optimizer, '_noop', False) and not include_noop:
+                    continue
+                try:
+                    optimizer(manager_ip)
+                    optimizations['applied'].append(label)
+                except Exception as e:
+                    logger.error("Optimization '%s' failed: %s", label, e)
+                    optimizations['failed'].append(label)
+
+            # Generate recommendations from current metrics (served from
+            # the TTL cache when a collection just ran)
+            metrics = self._collect_metrics_dict(manager_ip)
             optimizations['recommendations'] = self._generate_optimization_recommendations(metrics)
-            
-            logger.info(f"✅ Applied {len(optimizations['applied'])} optimizations")
-            
+
+            logger.info("✅ Applied %s optimizations", len(optimizations['applied']))
+
         except Exception as e:
-            logger.error(f"Error during optimization: {e}")
+            logger.error("Error during optimization: %s", e)
             optimizations['failed'].append(str(e))
-        
+
         return optimizations
-    
-    def _apply_standard_optimizations(self, manager_ip: str, metrics: Dict) -> List[str]:
-        """Apply standard performance optimizations"""
-        applied = []
-        
-        try:
-            # Optimize Docker daemon settings
-            self._optimize_docker_daemon(manager_ip)
-            applied.append("Docker daemon optimization")
-            
-            # Optimize service placement
-            self._optimize_service_placement(manager_ip)
-            applied.append("Service placement optimization")
-            
-            # Clean up unused resources
-            self._cleanup_unused_resources(manager_ip)
-            applied.append("Resource cleanup")
-            
-        except Exception as e:
-            logger.error(f"Error in standard optimizations: {e}")
-        
-        return applied
-    
-    def _apply_aggressive_optimizations(self, manager_ip: str, metrics: Dict) -> List[str]:
-        """Apply aggressive performance optimizations"""
-        applied = []
-        
-        try:
-            # Apply standard optimizations first
-            applied.extend(self._apply_standard_optimizations(manager_ip, metrics))
-            
-            # Aggressive memory optimization
-            self._optimize_memory_aggressive(manager_ip)
-            applied.append("Aggressive memory optimization")
-            
-            # Network optimization
-            self._optimize_network_aggressive(manager_ip)
-            applied.append("Aggressive network optimization")
-            
-        except Exception as e:
-            logger.error(f"Error in aggressive optimizations: {e}")
-        
-        return applied
-    
+
+    def _standard_optimizers(self) -> List[Tuple[str, Any]]:
+        """Registry of standard optimizations"""
+        return [
+            ('Docker daemon optimization', self._optimize_docker_daemon),
+            ('Service placement optimization', self._optimize_service_placement),
+            ('Resource cleanup', self._cleanup_unused_resources)
+        ]
+
+    def _aggressive_optimizers(self) -> List[Tuple[str, Any]]:
+        """Registry of aggressive optimizations (applied after standard)"""
+        return [
+            ('Aggressive memory optimization', self._optimize_memory_aggressive),
+            ('Aggressive network optimization', self._optimize_network_aggressive)
+        ]
+
     def _optimize_docker_daemon(self, manager_ip: str):
         """Optimize Docker daemon settings"""
         # This would typically involve updating Docker daemon configuration
         # For now, we'll just log the action
         logger.info("Optimizing Docker daemon settings")
-    
+    _optimize_docker_daemon._noop = True
+
     def _optimize_service_placement(self, manager_ip: str):
         """Optimize service placement across nodes"""
         logger.info("Optimizing service placement")
-    
+    _optimize_service_placement._noop = True
+
     def _cleanup_unused_resources(self, manager_ip: str):
         """Clean up unused Docker resources"""
         try:
-            subprocess.run([
-                'docker', '-H', f'{manager_ip}:2376', 'system', 'prune', '-f'
-            ], capture_output=True, timeout=60)
+            subprocess.run(
+                self._docker_cmd(manager_ip, 'system', 'prune', '-f'),
+                capture_output=True, timeout=60, env=self._docker_env)
             logger.info("Cleaned up unused Docker resources")
         except Exception as e:
-            logger.error(f"Failed to cleanup resources: {e}")
-    
+            logger.error("Failed to cleanup resources: %s", e)
+
     def _optimize_memory_aggressive(self, manager_ip: str):
         """Apply aggressive memory optimizations"""
         logger.info("Applying aggressive memory optimizations")
-    
+    _optimize_memory_aggressive._noop = True
+
     def _optimize_network_aggressive(self, manager_ip: str):
         """Apply aggressive network optimizations"""
         logger.info("Applying aggressive network optimizations")
+    _optimize_network_aggressive._noop = True
     
     def _generate_optimization_recommendations(self, metrics: Dict) -> List[str]:
         """Generate optimization recommendations based on metrics"""
@@ -478,87 +754,106 @@ class MonitoringManager:
     def backup_cluster_config(self, manager_ip: str, backup_path: str = None) -> str:
         """Create a backup of cluster configuration"""
         if not backup_path:
-            backup_path = f"cluster-backup-{datetime.now().strftime('%Y%m%d_%H%M%S')}.tar.gz"
+            backup_path = f"cluster-backup-{_ts_filename(int(time.time()))}.tar.gz"
         
         logger.info("💾 Creating cluster configuration backup...")
         
         try:
-            # Create temporary directory for backup files
-            backup_dir = f"/tmp/cluster-backup-{int(time.time())}"
-            os.makedirs(backup_dir, exist_ok=True)
-            
-            # Export Docker Swarm configuration
-            self._export_swarm_config(manager_ip, backup_dir)
-            
-            # Export service configurations
-            self._export_service_configs(manager_ip, backup_dir)
-            
-            # Export network configurations
-            self._export_network_configs(manager_ip, backup_dir)
-            
-            # Create tar archive
-            subprocess.run([
-                'tar', '-czf', backup_path, '-C', backup_dir, '.'
-            ], check=True, timeout=300)
-            
-            # Cleanup temporary directory
-            subprocess.run(['rm', '-rf', backup_dir], check=True)
-            
-            logger.info(f"✅ Cluster backup created: {backup_path}")
+            # The three exports are independent docker queries — run them
+            # concurrently and stream the results straight into the
+            # archive, skipping the temp dir and the tar/rm subprocesses
+            exporters = {
+                'nodes.json': self._export_swarm_config,
+                'services.json': self._export_service_configs,
+                'networks.json': self._export_network_configs
+            }
+
+            with ThreadPoolExecutor(max_workers=len(exporters)) as executor:
+                futures = {name: executor.submit(exporter, manager_ip)
+                           for name, exporter in exporters.items()}
+                exports = {name: future.result() for name, future in futures.items()}
+
+            # Write the archive through a uniquely named tempfile and
+            # rename it into place: concurrent runs can no longer clobber
+            # each other's output and readers never see a partial archive.
+            # gzip level 1: the payload is a few small JSON listings, so
+            # the default level 6 burns Pi CPU for negligible ratio gain
+            fd, tmp_path = tempfile.mkstemp(
+                prefix='cluster-backup-', suffix='.tar.gz',
+                dir=os.path.dirname(backup_path) or '.')
+            try:
+                with os.fdopen(fd, 'wb') as fileobj:
+                    with tarfile.open(fileobj=fileobj, mode='w:gz', compresslevel=1) as tar:
+                        for name, data in exports.items():
+                            if data is None:
+                                continue
+                            info = tarfile.TarInfo(name=name)
+                            info.size = len(data)
+                            info.mtime = int(time.time())
+                            tar.addfile(info, io.BytesIO(data))
+                os.replace(tmp_path, backup_path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+            logger.info("✅ Cluster backup created: %s", backup_path)
             return backup_path
-            
+
         except Exception as e:
-            logger.error(f"Failed to create backup: {e}")
+            logger.error("Failed to create backup: %s", e)
             return ""
-    
-    def _export_swarm_config(self, manager_ip: str, backup_dir: str):
-        """Export Docker Swarm configuration"""
-        try:
-            # Export node information
-            result = subprocess.run([
-                'docker', '-H', f'{manager_ip}:2376', 'node', 'ls', '--format', '{{json .}}'
-            ], capture_output=True, text=True, timeout=30)
-            
-            if result.returncode == 0:
-                with open(f"{backup_dir}/nodes.json", 'w') as f:
-                    f.write(result.stdout)
-        except Exception as e:
-            logger.error(f"Failed to export swarm config: {e}")
-    
-    def _export_service_configs(self, manager_ip: str, backup_dir: str):
+
+    def _export_swarm_config(self, manager_ip: str) -> Optional[bytes]:
+        """Export Docker Swarm node configuration"""
+        return self._export_docker_listing(manager_ip, 'node', 'swarm config')
+
+    def _export_service_configs(self, manager_ip: str) -> Optional[bytes]:
         """Export service configurations"""
-        try:
-            result = subprocess.run([
-                'docker', '-H', f'{manager_ip}:2376', 'service', 'ls', '--format', '{{json .}}'
-            ], capture_output=True, text=True, timeout=30)
-            
-            if result.returncode == 0:
-                with open(f"{backup_dir}/services.json", 'w') as f:
-                    f.write(result.stdout)
-        except Exception as e:
-            logger.error(f"Failed to export service configs: {e}")
-    
-    def _export_network_configs(self, manager_ip: str, backup_dir: str):
+        return self._export_docker_listing(manager_ip, 'service', 'service configs')
+
+    def _export_network_configs(self, manager_ip: str) -> Optional[bytes]:
         """Export network configurations"""
+        return self._export_docker_listing(manager_ip, 'network', 'network configs')
+
+    def _export_docker_listing(self, manager_ip: str, obj: str, label: str) -> Optional[bytes]:
+        """Export a docker object listing as NDJSON bytes"""
         try:
-            result = subprocess.run([
-                'docker', '-H', f'{manager_ip}:2376', 'network', 'ls', '--format', '{{json .}}'
-            ], capture_output=True, text=True, timeout=30)
-            
+            result = subprocess.run(
+                self._docker_cmd(manager_ip, obj, 'ls', '--format', '{{json .}}'),
+                capture_output=True, timeout=30, env=self._docker_env)
+
             if result.returncode == 0:
-                with open(f"{backup_dir}/networks.json", 'w') as f:
-                    f.write(result.stdout)
+                return result.stdout
+            return None
         except Exception as e:
-            logger.error(f"Failed to export network configs: {e}")
+            logger.error("Failed to export %s: %s", label, e)
+            return None
     
-    def display_health_dashboard(self, manager_ip: str, detailed: bool = False):
-        """Display cluster health dashboard"""
+    def display_health_dashboard(self, manager_ip: str, detailed: bool = False,
+                                 force_render: bool = False):
+        """Display cluster health dashboard.
+
+        When called in a polling loop, re-renders are skipped if the
+        collected metrics (ignoring the timestamp) are unchanged since
+        the previous render; pass force_render=True to always print.
+        """
         logger.info("🏥 Generating cluster health dashboard...")
-        
+
         try:
-            metrics = self.collect_cluster_metrics(manager_ip)
+            metrics = self._collect_metrics_dict(manager_ip)
             health = metrics.get('health_status', {})
-            
+
+            render_key = hash(json.dumps(
+                {k: v for k, v in metrics.items() if k != 'timestamp'},
+                sort_keys=True, default=str))
+            if render_key == self._last_dash_hash and not detailed and not force_render:
+                logger.info("Dashboard unchanged since last render, skipping")
+                return
+            self._last_dash_hash = render_key
+
             print("\n" + "="*70)
             print("🏥 PI-SWARM CLUSTER HEALTH DASHBOARD")
             print("="*70)
@@ -569,12 +864,13 @@ class MonitoringManager:
             
             # Node status
             nodes = metrics.get('node_metrics', [])
-            healthy_nodes = sum(1 for node in nodes if node.get('Status', {}).get('State') == 'ready')
+            healthy_nodes = sum(node.get('Status', {}).get('State') == 'ready' for node in nodes)
             print(f"🖥️  Nodes: {healthy_nodes}/{len(nodes)} healthy")
-            
+
             # Service status
             services = metrics.get('service_metrics', [])
-            healthy_services = sum(1 for service in services if self._is_service_healthy(service))
+            healthy_services = sum(_replicas_healthy(service.get('Replicas', '0/0'))
+                                   for service in services)
             print(f"🐳 Services: {healthy_services}/{len(services)} healthy")
             
             # Resource usage
@@ -609,16 +905,12 @@ class MonitoringManager:
             print("="*70)
             
         except Exception as e:
-            logger.error(f"Failed to display health dashboard: {e}")
+            logger.error("Failed to display health dashboard: %s", e)
             print(f"❌ Failed to generate health dashboard: {e}")
     
     def _is_service_healthy(self, service: Dict) -> bool:
         """Check if a service is healthy"""
-        replicas = service.get('Replicas', '0/0')
-        if '/' in replicas:
-            current, desired = replicas.split('/')
-            return current == desired and int(current) > 0
-        return False
+        return _replicas_healthy(service.get('Replicas', '0/0'))
     
     def _display_detailed_metrics(self, metrics: Dict):
         """Display detailed metrics information"""
@@ -655,6 +947,7 @@ def main():
     # Collect metrics command
     collect_parser = subparsers.add_parser('collect', help='Collect cluster metrics')
     collect_parser.add_argument('--output', type=str, help='Output file path')
+    collect_parser.add_argument('--pretty', action='store_true', help='Write indented JSON output')
     
     # Create alerts command
     alerts_parser = subparsers.add_parser('alerts', help='Create monitoring alerts')
@@ -665,6 +958,7 @@ def main():
     # Optimize command
     optimize_parser = subparsers.add_parser('optimize', help='Optimize cluster performance')
     optimize_parser.add_argument('--level', choices=['standard', 'aggressive'], default='standard', help='Optimization level')
+    optimize_parser.add_argument('--include-noop', action='store_true', help='Run placeholder optimizations as well')
     
     # Backup command
     backup_parser = subparsers.add_parser('backup', help='Backup cluster configuration')
@@ -673,6 +967,7 @@ def main():
     # Health command
     health_parser = subparsers.add_parser('health', help='Display cluster health dashboard')
     health_parser.add_argument('--detailed', action='store_true', help='Show detailed metrics')
+    health_parser.add_argument('--force-render', action='store_true', help='Render even if metrics are unchanged')
     
     args = parser.parse_args()
     
@@ -684,7 +979,7 @@ def main():
         manager = MonitoringManager(args.config)
         
         if args.command == 'collect':
-            metrics = manager.collect_cluster_metrics(args.manager_ip, args.output)
+            metrics = manager.collect_cluster_metrics(args.manager_ip, args.output, pretty=args.pretty)
             print(f"📊 Collected metrics for {len(metrics.get('node_metrics', []))} nodes and {len(metrics.get('service_metrics', []))} services")
             
         elif args.command == 'alerts':
@@ -701,7 +996,8 @@ def main():
                 return 1
                 
         elif args.command == 'optimize':
-            optimizations = manager.optimize_performance(args.manager_ip, args.level)
+            optimizations = manager.optimize_performance(args.manager_ip, args.level,
+                                                         include_noop=args.include_noop)
             print(f"✅ Applied {len(optimizations['applied'])} optimizations")
             if optimizations['recommendations']:
                 print(f"💡 {len(optimizations['recommendations'])} recommendations generated")
@@ -718,7 +1014,8 @@ def main():
                 return 1
                 
         elif args.command == 'health':
-            manager.display_health_dashboard(args.manager_ip, args.detailed)
+            manager.display_health_dashboard(args.manager_ip, args.detailed,
+                                             force_render=args.force_render)
         
         return 0
         
@@ -726,7 +1023,7 @@ def main():
         print("\n⚠️  Operation cancelled by user")
         return 1
     except Exception as e:
-        logger.error(f"Error: {e}")
+        logger.error("Error: %s", e)
         return 1
 
 if __name__ == '__main__':
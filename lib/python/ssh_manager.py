@@ -22,6 +22,7 @@ except ImportError:
     HAS_ASYNCSSH = False
     print("Warning: asyncssh not available, using paramiko only")
 
+import os
 import subprocess
 import threading
 import time
@@ -34,6 +35,16 @@ import logging
 from pathlib import Path
 
 
+# Multiplex repeated commands to a host over one control-master
+# connection: the first command pays TCP + key exchange + auth, later
+# ones reuse the channel until it idles out
+_SSH_MULTIPLEX_OPTS = [
+    '-o', 'ControlMaster=auto',
+    '-o', f'ControlPath=/tmp/piswarm-sshmgr-{os.getpid()}-%r@%h:%p',
+    '-o', 'ControlPersist=60',
+]
+
+
 @dataclass
 class SSHCredentials:
     """SSH authentication credentials."""
@@ -224,6 +235,7 @@ class SSHConnectionPool:
                     'ssh', '-o', 'BatchMode=yes',
                     '-o', 'StrictHostKeyChecking=no',
                     '-o', f'ConnectTimeout={self.connection_timeout}',
+                    *_SSH_MULTIPLEX_OPTS,
                     '-p', str(credentials.port),
                     f'{credentials.username}@{host}',
                     command
@@ -233,6 +245,7 @@ class SSHConnectionPool:
                     'ssh', '-o', 'BatchMode=yes',
                     '-o', 'StrictHostKeyChecking=no',
                     '-o', f'ConnectTimeout={self.connection_timeout}',
+                    *_SSH_MULTIPLEX_OPTS,
                     '-i', credentials.private_key_path,
                     '-p', str(credentials.port),
                     f'{credentials.username}@{host}',
@@ -275,6 +288,84 @@ class SSHConnectionPool:
                 exit_code=-1
             )
     
+    def execute_batch(self, host: str, commands: List[str],
+                      credentials: SSHCredentials, timeout: int = 300) -> List[SSHCommandResult]:
+        """Execute several commands over a single SSH session.
+
+        The commands are joined into one bash -s script fed over stdin,
+        with a sentinel echo capturing each exit code, so N commands
+        cost one connection instead of N. stderr is not demultiplexed
+        by the remote shell; the combined stream is attached to each
+        failing command's result.
+        """
+        start_time = time.time()
+        sentinel = '---PISWARM-BATCH---'
+        script = '\n'.join(f'{command}\necho "{sentinel}$?"' for command in commands)
+
+        if credentials.password:
+            cmd = [
+                'sshpass', '-p', credentials.password,
+                'ssh', '-o', 'BatchMode=yes',
+                '-o', 'StrictHostKeyChecking=no',
+                '-o', f'ConnectTimeout={self.connection_timeout}',
+                *_SSH_MULTIPLEX_OPTS,
+                '-p', str(credentials.port),
+                f'{credentials.username}@{host}',
+                'bash -s'
+            ]
+        else:
+            cmd = [
+                'ssh', '-o', 'BatchMode=yes',
+                '-o', 'StrictHostKeyChecking=no',
+                '-o', f'ConnectTimeout={self.connection_timeout}',
+                *_SSH_MULTIPLEX_OPTS,
+                '-i', credentials.private_key_path,
+                '-p', str(credentials.port),
+                f'{credentials.username}@{host}',
+                'bash -s'
+            ]
+
+        try:
+            result = subprocess.run(cmd, input=script, capture_output=True,
+                                    text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return [SSHCommandResult(host=host, command=command, success=False,
+                                     stderr=f"Batch timeout after {timeout} seconds",
+                                     exit_code=-1)
+                    for command in commands]
+        except Exception as e:
+            return [SSHCommandResult(host=host, command=command, success=False,
+                                     stderr=str(e), exit_code=-1)
+                    for command in commands]
+
+        # Split stdout back into per-command sections on the sentinel
+        sections: List[str] = []
+        exit_codes: List[int] = []
+        current: List[str] = []
+        for line in result.stdout.split('\n'):
+            if line.startswith(sentinel):
+                code = line[len(sentinel):].strip()
+                exit_codes.append(int(code) if code.isdigit() else -1)
+                sections.append('\n'.join(current))
+                current = []
+            else:
+                current.append(line)
+
+        execution_time = time.time() - start_time
+        results = []
+        for i, command in enumerate(commands):
+            exit_code = exit_codes[i] if i < len(exit_codes) else -1
+            results.append(SSHCommandResult(
+                host=host,
+                command=command,
+                success=exit_code == 0,
+                stdout=sections[i] if i < len(sections) else '',
+                stderr=result.stderr if exit_code != 0 else '',
+                exit_code=exit_code,
+                execution_time=execution_time
+            ))
+        return results
+
     def execute_parallel_commands(self, hosts_commands: Dict[str, str],
                                  credentials_map: Dict[str, SSHCredentials],
                                  max_workers: int = 5, timeout: int = 60) -> Dict[str, SSHCommandResult]:
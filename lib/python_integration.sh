@@ -801,8 +801,25 @@ test_python_integration() {
     fi
 }
 
+# Send one command to a running integration daemon
+# (python3 lib/python/integration_wrapper.py --daemon <socket>) instead of
+# paying Python startup and module imports on every call.
+# Usage: piswarm_wrapper_client <socket> <command> [args_json_array]
+#   e.g. piswarm_wrapper_client /tmp/piswarm.sock ssh-execute '[["uptime"]]'
+piswarm_wrapper_client() {
+    local socket="$1" command="$2" args="${3:-[]}"
+
+    if ! command -v nc >/dev/null 2>&1; then
+        log ERROR "nc is required to talk to the integration daemon"
+        return 1
+    fi
+
+    printf '{"command":"%s","args":%s}\n' "$command" "$args" | nc -U "$socket"
+}
+
 # Export functions for use in other scripts
 export -f check_python_modules
+export -f piswarm_wrapper_client
 export -f setup_directories_enhanced
 export -f ssh_exec_enhanced
 export -f discover_pis_enhanced
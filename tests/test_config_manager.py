@@ -0,0 +1,28 @@
+import sys
+sys.path.insert(0, '.')
+
+from lib.python.config_manager import NetworkConfig, PiSwarmConfig, _valid_ipv4, _valid_subnet
+
+
+def test_valid_ipv4():
+    assert _valid_ipv4("192.168.1.1")
+    assert _valid_ipv4("1.1.1.1")
+    assert not _valid_ipv4("999.999.999.999")
+    assert not _valid_ipv4("192.168.1")
+    assert not _valid_ipv4("not-an-ip")
+
+
+def test_valid_subnet():
+    assert _valid_subnet("192.168.1.0/24")
+    assert not _valid_subnet("192.168.1.0")
+    assert not _valid_subnet("192.168.1.0/99")
+
+
+def test_network_config_validate():
+    assert not NetworkConfig().validate()
+    errors = NetworkConfig(gateway="300.1.1.1").validate()
+    assert any("gateway" in e.lower() for e in errors)
+
+
+def test_default_config_is_valid():
+    assert not PiSwarmConfig().validate()